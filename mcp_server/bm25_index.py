@@ -0,0 +1,172 @@
+"""
+Array-backed Okapi BM25 index
+
+Stores term postings as CSR (structure-of-arrays) NumPy arrays instead of
+rank-bm25's per-document Python dicts. Scores match rank_bm25.BM25Okapi
+(same k1/b/epsilon defaults and IDF floor) so it is a drop-in replacement
+for hybrid search.
+"""
+
+import re
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# Lowercased word tokens; punctuation is dropped so "claim," matches "claim".
+# TOKENIZER is saved with each index so one built with another scheme can be detected
+_TOKEN_RE = re.compile(r"\w+")
+TOKENIZER = "word-lower"
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens for BM25 indexing and queries"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over CSR posting lists
+
+    For term id t, doc_ids[indptr[t]:indptr[t + 1]] are the documents containing t
+    and weights[...] the precomputed term-frequency factor
+    tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_len / avgdl)).
+    Scoring a query is one vectorized scatter-add per query term instead of a
+    Python loop over every document, and the arrays save to a single .npz file.
+    """
+
+    def __init__(
+        self,
+        vocab: dict[str, int],
+        idf: np.ndarray,
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        weights: np.ndarray,
+        num_docs: int,
+        tokenizer: str = TOKENIZER,
+    ):
+        self.vocab = vocab
+        self.idf = idf
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.num_docs = num_docs
+        self.tokenizer = tokenizer
+
+    @classmethod
+    def from_corpus(
+        cls,
+        tokenized_corpus: Iterable[list[str]],
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+        tokenizer: str = TOKENIZER,
+    ) -> "BM25Index":
+        """Build an index from tokenized documents (one token list per document)
+
+        tokenizer names the scheme used to produce the tokens (see tokenize()).
+        """
+        vocab: dict[str, int] = {}
+        doc_lens = array("i")
+        post_terms = array("i")
+        post_docs = array("i")
+        post_tfs = array("i")
+
+        for doc_id, tokens in enumerate(tokenized_corpus):
+            doc_lens.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                post_terms.append(vocab.setdefault(term, len(vocab)))
+                post_docs.append(doc_id)
+                post_tfs.append(tf)
+
+        num_docs = len(doc_lens)
+        num_terms = len(vocab)
+        doc_len = np.frombuffer(doc_lens, dtype=np.int32).astype(np.float32)
+        avgdl = float(doc_len.mean()) if num_docs else 0.0
+
+        # Group postings by term (stable sort keeps doc ids ascending within a term)
+        terms = np.frombuffer(post_terms, dtype=np.int32)
+        order = np.argsort(terms, kind="stable")
+        doc_ids = np.frombuffer(post_docs, dtype=np.int32)[order]
+        tfs = np.frombuffer(post_tfs, dtype=np.int32)[order].astype(np.float32)
+
+        doc_freq = np.bincount(terms, minlength=num_terms)
+        indptr = np.zeros(num_terms + 1, dtype=np.int64)
+        np.cumsum(doc_freq, out=indptr[1:])
+
+        norm = k1 * (1 - b + b * doc_len[doc_ids] / avgdl) if avgdl else k1 * (1 - b)
+        weights = (tfs * (k1 + 1) / (tfs + norm)).astype(np.float32)
+
+        # IDF as in rank-bm25: negative values are floored to epsilon * mean IDF
+        idf = np.log(num_docs - doc_freq + 0.5) - np.log(doc_freq + 0.5)
+        if num_terms:
+            idf[idf < 0] = epsilon * idf.mean()
+
+        return cls(vocab, idf.astype(np.float32), indptr, doc_ids, weights, num_docs, tokenizer)
+
+    def get_scores(self, query: list[str]) -> np.ndarray:
+        """BM25 score of every document for a tokenized query (same API as BM25Okapi)"""
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        for term in query:
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            # Doc ids are unique within a posting list, so fancy-index += is safe
+            scores[self.doc_ids[start:end]] += self.idf[term_id] * self.weights[start:end]
+        return scores
+
+    def top_k(
+        self, query: list[str], k: int, allowed: Optional[np.ndarray] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Ids and scores of the k best-scoring documents for a tokenized query, best first
+
+        Selects with a partial sort (O(N)) and sorts only the k selected documents.
+        allowed is an optional boolean mask over documents; others are never returned.
+        """
+        scores = self.get_scores(query)
+        k = min(k, self.num_docs)
+        if allowed is not None:
+            scores[~allowed] = -np.inf
+            k = min(k, int(np.count_nonzero(allowed)))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        doc_ids = np.argpartition(scores, -k)[-k:]
+        doc_ids = doc_ids[np.argsort(-scores[doc_ids], kind="stable")]
+        return doc_ids, scores[doc_ids]
+
+    def save(self, path: Path) -> None:
+        """Save the index arrays to a .npz file"""
+        # Tokens never contain newlines (whitespace/word tokenization), so the
+        # vocabulary is stored as one newline-joined UTF-8 buffer
+        terms = "\n".join(self.vocab).encode("utf-8")
+        with path.open("wb") as f:
+            np.savez(
+                f,
+                vocab=np.frombuffer(terms, dtype=np.uint8),
+                idf=self.idf,
+                indptr=self.indptr,
+                doc_ids=self.doc_ids,
+                weights=self.weights,
+                num_docs=np.array(self.num_docs, dtype=np.int64),
+                tokenizer=np.array(self.tokenizer),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "BM25Index":
+        """Load an index saved with save()"""
+        with np.load(path, allow_pickle=False) as data:
+            terms = data["vocab"].tobytes().decode("utf-8")
+            vocab = {term: i for i, term in enumerate(terms.split("\n"))} if terms else {}
+            return cls(
+                vocab,
+                data["idf"],
+                data["indptr"],
+                data["doc_ids"],
+                data["weights"],
+                int(data["num_docs"]),
+                # Indexes saved before the tokenizer was recorded used str.split()
+                str(data["tokenizer"]) if "tokenizer" in data else "whitespace",
+            )
@@ -0,0 +1,480 @@
+"""
+Chunk text and metadata storage
+
+Chunk texts are stored as zlib-compressed blocks of consecutive chunks in one
+memory-mapped file, with int64 offset tables alongside, so an index with
+millions of chunks opens instantly and only the blocks holding the chunks a
+search actually returns are paged in and decompressed.
+
+Chunk metadata is stored structure-of-arrays: patent-level (or, for the MPEP
+index, page-level) fields once per patent or page, and per chunk only small
+integer columns.
+"""
+
+import mmap
+import zlib
+from array import array
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import numpy as np
+
+from mcp_server.utils.json_io import dump_json, load_json
+
+
+class ChunkStore(Sequence[str]):
+    """Read-only sequence of chunk texts backed by a memory-mapped, block-compressed file
+
+    Chunks are grouped into blocks of BLOCK_SIZE consecutive chunks, each compressed
+    independently. offsets[i] is the start of chunk i in the uncompressed text and
+    block_offsets[k] the start of block k in the data file. Recently read blocks are
+    kept decompressed, so sequential reads decompress each block once.
+
+    The files stay mapped until close() (or the end of a with block); close the store
+    before rewriting its files, which Windows refuses while they are mapped.
+    """
+
+    BLOCK_SIZE = 64
+    COMPRESSION_LEVEL = 6
+    BLOCK_CACHE_SIZE = 256
+
+    def __init__(self, data_file: Path, offsets_file: Path, blocks_file: Path):
+        self.offsets = np.load(offsets_file, mmap_mode="r")
+        # Stores written before block compression have no block table and hold raw UTF-8
+        self.block_offsets = np.load(blocks_file, mmap_mode="r") if blocks_file.exists() else None
+        with data_file.open("rb") as f:
+            # mmap cannot map an empty file; an empty store has nothing to read anyway
+            if data_file.stat().st_size:
+                self._data: Union[mmap.mmap, bytes] = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            else:
+                self._data = b""
+        # Per instance, so close() can drop the cached blocks along with the mapping
+        self._read_block = lru_cache(maxsize=self.BLOCK_CACHE_SIZE)(self._read_block_uncached)
+
+    def close(self) -> None:
+        """Unmap the data and offset files; the store then reads as empty"""
+        self._read_block.cache_clear()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b""
+        # Dropping the np.load(mmap_mode="r") arrays releases their mappings
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.block_offsets = None
+
+    def __enter__(self) -> "ChunkStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @classmethod
+    def write(
+        cls, chunks: Iterable[str], data_file: Path, offsets_file: Path, blocks_file: Path
+    ) -> None:
+        """Write chunk texts as compressed blocks plus chunk and block offset tables"""
+        offsets = array("q", [0])
+        block_offsets = array("q", [0])
+        block: list[bytes] = []
+
+        with data_file.open("wb") as f:
+
+            def flush_block():
+                compressed = zlib.compress(b"".join(block), cls.COMPRESSION_LEVEL)
+                block_offsets.append(block_offsets[-1] + f.write(compressed))
+                block.clear()
+
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                offsets.append(offsets[-1] + len(data))
+                block.append(data)
+                if len(block) == cls.BLOCK_SIZE:
+                    flush_block()
+            if block:
+                flush_block()
+
+        np.save(offsets_file, np.frombuffer(offsets, dtype=np.int64))
+        np.save(blocks_file, np.frombuffer(block_offsets, dtype=np.int64))
+
+    def _read_block_uncached(self, block: int) -> bytes:
+        start, end = int(self.block_offsets[block]), int(self.block_offsets[block + 1])
+        return zlib.decompress(self._data[start:end])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx):  # type: ignore[override]
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        size = len(self)
+        if idx < 0:
+            idx += size
+        if not 0 <= idx < size:
+            raise IndexError("chunk index out of range")
+
+        start, end = int(self.offsets[idx]), int(self.offsets[idx + 1])
+        if self.block_offsets is None:
+            return self._data[start:end].decode("utf-8")
+
+        block = int(idx) // self.BLOCK_SIZE
+        base = int(self.offsets[block * self.BLOCK_SIZE])
+        return self._read_block(block)[start - base : end - base].decode("utf-8")
+
+
+# Chunk section kinds; sections are "<kind>" or "<kind>_<number>" (e.g. "claim_3")
+SECTION_KINDS = ("title", "abstract", "claim", "description")
+
+# Fields shared by every chunk of a patent
+PATENT_FIELDS = ("patent_id", "cpc_codes", "filing_date", "grant_date", "inventors", "assignee")
+
+
+def _date_int(value: Optional[str]) -> int:
+    """Convert a stored "YYYY-MM-DD" or "YYYYMMDD" date to an int YYYYMMDD
+
+    Missing, partial or malformed dates give 0 (unknown).
+    """
+    digits = (value or "").replace("-", "")
+    return int(digits) if len(digits) == 8 and digits.isdecimal() else 0
+
+
+def _date_bound(value: Optional[str], end: bool) -> int:
+    """Convert a date range bound to an int YYYYMMDD
+
+    "YYYY" and "YYYY-MM" (dashes optional) cover the whole year or month: a start
+    bound is padded to its first day, an end bound to its last. A missing or
+    malformed bound leaves that side of the range open.
+    """
+    digits = (value or "").replace("-", "")
+    if not digits.isdecimal() or len(digits) not in (4, 6, 8):
+        return 99999999 if end else 0
+    if len(digits) == 4:
+        digits += "1231" if end else "0101"
+    elif len(digits) == 6:
+        # Day 31 is past the end of every month, so it keeps the whole month
+        digits += "31" if end else "01"
+    return int(digits)
+
+
+class ChunkMetadata(Sequence[dict[str, Any]]):
+    """Per-chunk patent metadata stored as a patent table plus per-chunk arrays
+
+    Chunk i belongs to patents[patent_idx[i]] and is section
+    SECTION_KINDS[section_code[i]] numbered section_num[i] (0 for title/abstract).
+    Indexing returns the same dict the old one-dict-per-chunk JSON held, built on
+    demand, while the arrays can be used directly for vectorized filtering.
+    """
+
+    def __init__(
+        self,
+        patents: list[dict[str, Any]],
+        patent_idx: np.ndarray,
+        section_code: np.ndarray,
+        section_num: np.ndarray,
+    ):
+        self.patents = patents
+        self.patent_idx = patent_idx
+        self.section_code = section_code
+        self.section_num = section_num
+
+        # Per-patent filter columns, built on first filtered search
+        self._grant_dates: Optional[np.ndarray] = None
+        self._cpc_indptr: Optional[np.ndarray] = None
+        self._cpc_codes: Optional[np.ndarray] = None
+
+        # patent_id -> chunk positions (CSR over chunks sorted by patent row), built on first use
+        self._patent_rows: Optional[dict[str, int]] = None
+        self._chunk_order: Optional[np.ndarray] = None
+        self._chunk_indptr: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict[str, Any]]) -> "ChunkMetadata":
+        """Build from per-chunk metadata dicts (as produced by chunk_patent)"""
+        patents: list[dict[str, Any]] = []
+        patent_rows: dict[str, int] = {}
+        patent_idx = array("i")
+        section_code = array("b")
+        section_num = array("i")
+
+        for meta in records:
+            row = patent_rows.get(meta["patent_id"])
+            if row is None:
+                row = patent_rows[meta["patent_id"]] = len(patents)
+                patents.append({field: meta.get(field) for field in PATENT_FIELDS})
+
+            kind, _, num = meta["section"].partition("_")
+            patent_idx.append(row)
+            section_code.append(SECTION_KINDS.index(kind))
+            section_num.append(int(num or 0))
+
+        return cls(
+            patents,
+            np.frombuffer(patent_idx, dtype=np.int32),
+            np.frombuffer(section_code, dtype=np.int8),
+            np.frombuffer(section_num, dtype=np.int32),
+        )
+
+    def save(self, patents_file: Path, arrays_file: Path) -> None:
+        """Save the patent table (JSON) and per-chunk arrays (.npz)"""
+        dump_json({"patents": self.patents, "num_chunks": len(self)}, patents_file)
+        with arrays_file.open("wb") as f:
+            np.savez(
+                f,
+                patent_idx=self.patent_idx,
+                section_code=self.section_code,
+                section_num=self.section_num,
+            )
+
+    @classmethod
+    def load(cls, patents_file: Path, arrays_file: Path) -> "ChunkMetadata":
+        """Load metadata saved with save()"""
+        patents = load_json(patents_file)["patents"]
+        with np.load(arrays_file, allow_pickle=False) as data:
+            return cls(patents, data["patent_idx"], data["section_code"], data["section_num"])
+
+    def __len__(self) -> int:
+        return len(self.patent_idx)
+
+    def __getitem__(self, idx):  # type: ignore[override]
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        # Copy so callers cannot mutate the row shared by all chunks of the patent
+        meta = dict(self.patents[self.patent_idx[idx]])
+        kind = SECTION_KINDS[self.section_code[idx]]
+        num = int(self.section_num[idx])
+        meta["section"] = f"{kind}_{num}" if num else kind
+        if kind == "claim":
+            meta["claim_number"] = num
+        return meta
+
+    def chunks_for_patent(self, patent_id: str) -> np.ndarray:
+        """Chunk indices belonging to a patent, in chunk order (empty if unknown)"""
+        if self._patent_rows is None:
+            self._patent_rows = {
+                patent["patent_id"]: row for row, patent in enumerate(self.patents)
+            }
+            self._chunk_order = np.argsort(self.patent_idx, kind="stable")
+            self._chunk_indptr = np.zeros(len(self.patents) + 1, dtype=np.int64)
+            np.cumsum(
+                np.bincount(self.patent_idx, minlength=len(self.patents)),
+                out=self._chunk_indptr[1:],
+            )
+
+        row = self._patent_rows.get(patent_id)
+        if row is None:
+            return np.empty(0, dtype=np.int64)
+        return self._chunk_order[self._chunk_indptr[row] : self._chunk_indptr[row + 1]]
+
+    def _build_filter_columns(self) -> None:
+        """Build grant dates (int YYYYMMDD) and CSR-flattened CPC codes per patent"""
+        if self._grant_dates is not None:
+            return
+
+        grant_dates = np.zeros(len(self.patents), dtype=np.int32)
+        cpc_indptr = np.zeros(len(self.patents) + 1, dtype=np.int64)
+        cpc_codes: list[bytes] = []
+        for row, patent in enumerate(self.patents):
+            grant_dates[row] = _date_int(patent.get("grant_date"))
+            cpc_codes.extend(code.encode("utf-8") for code in patent.get("cpc_codes") or [])
+            cpc_indptr[row + 1] = len(cpc_codes)
+
+        self._grant_dates = grant_dates
+        self._cpc_indptr = cpc_indptr
+        self._cpc_codes = np.array(cpc_codes, dtype=np.bytes_)
+
+    def filter_mask(
+        self,
+        chunk_idx: np.ndarray,
+        cpc_prefix: Optional[str] = None,
+        date_range: Optional[tuple[str, str]] = None,
+    ) -> np.ndarray:
+        """Boolean mask of the chunks that pass the CPC prefix and grant date filters
+
+        Args:
+            chunk_idx: Chunk indices to test
+            cpc_prefix: Keep chunks whose patent has a CPC code starting with this
+            date_range: Keep chunks granted in (start, end), inclusive. Bounds are
+                "YYYYMMDD", "YYYY-MM-DD", or partial "YYYY" / "YYYY-MM" covering the
+                whole year or month; a missing or malformed bound is open-ended.
+                Chunks whose grant date is missing or malformed cannot be placed in
+                the range and are kept
+
+        Returns:
+            Boolean array aligned with chunk_idx
+        """
+        self._build_filter_columns()
+        rows = self.patent_idx[chunk_idx]
+        mask = np.ones(len(rows), dtype=bool)
+
+        if cpc_prefix:
+            # Gather every CPC code of the candidate patents from the CSR arrays
+            starts = self._cpc_indptr[rows]
+            counts = self._cpc_indptr[rows + 1] - starts
+            block_starts = np.cumsum(counts) - counts
+            positions = np.arange(counts.sum()) + np.repeat(starts - block_starts, counts)
+            owners = np.repeat(np.arange(len(rows)), counts)
+
+            hits = np.char.startswith(self._cpc_codes[positions], cpc_prefix.encode("utf-8"))
+            mask &= np.bincount(owners[hits], minlength=len(rows)) > 0
+
+        if date_range:
+            start, end = _date_bound(date_range[0], False), _date_bound(date_range[1], True)
+            dates = self._grant_dates[rows]
+            mask &= (dates == 0) | ((start <= dates) & (dates <= end))
+
+        return mask
+
+
+# Per-chunk boolean fields of MPEP/statute chunks; every other field is shared by the page
+PAGE_CHUNK_FLAGS = ("has_mpep_ref", "has_statute", "has_rule_ref")
+
+# Page-level boolean fields that searches can filter on
+PAGE_FILTER_FLAGS = ("is_statute", "is_regulation", "is_update")
+
+
+def _page_key(record: dict[str, Any]) -> tuple:
+    """Hashable key of a page record (list values such as affected sections become tuples)"""
+    return tuple((k, tuple(v) if isinstance(v, list) else v) for k, v in record.items())
+
+
+class PageMetadata(Sequence[dict[str, Any]]):
+    """Per-chunk source metadata stored as a table of distinct page records plus flag bits
+
+    Chunk i belongs to pages[page_idx[i]] and bit j of flags[i] holds
+    PAGE_CHUNK_FLAGS[j]. Chunks cut from the same page share one record, so the
+    table stays small however finely pages are chunked. Indexing returns the same
+    dict the old one-dict-per-chunk JSON held, built on demand.
+    """
+
+    def __init__(self, pages: list[dict[str, Any]], page_idx: np.ndarray, flags: np.ndarray):
+        self.pages = pages
+        self.page_idx = page_idx
+        self.flags = flags
+
+        # Per-page filter columns, built on first filtered search
+        self._sources: Optional[np.ndarray] = None
+        self._page_flags: Optional[dict[str, np.ndarray]] = None
+        # Section -> chunk indices, built on first section lookup
+        self._section_chunks: Optional[dict[str, np.ndarray]] = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict[str, Any]]) -> "PageMetadata":
+        """Build from per-chunk metadata dicts"""
+        pages: list[dict[str, Any]] = []
+        page_rows: dict[tuple, int] = {}
+        page_idx = array("i")
+        flags = array("B")
+
+        for meta in records:
+            page = {k: v for k, v in meta.items() if k not in PAGE_CHUNK_FLAGS}
+            key = _page_key(page)
+            row = page_rows.get(key)
+            if row is None:
+                row = page_rows[key] = len(pages)
+                pages.append(page)
+
+            page_idx.append(row)
+            flags.append(
+                sum(1 << bit for bit, flag in enumerate(PAGE_CHUNK_FLAGS) if meta.get(flag))
+            )
+
+        return cls(
+            pages,
+            np.frombuffer(page_idx, dtype=np.int32),
+            np.frombuffer(flags, dtype=np.uint8),
+        )
+
+    def save(self, pages_file: Path, arrays_file: Path) -> None:
+        """Save the page table (JSON) and per-chunk arrays (.npz)"""
+        dump_json({"pages": self.pages, "num_chunks": len(self)}, pages_file)
+        with arrays_file.open("wb") as f:
+            np.savez(f, page_idx=self.page_idx, flags=self.flags)
+
+    @classmethod
+    def load(cls, pages_file: Path, arrays_file: Path) -> "PageMetadata":
+        """Load metadata saved with save()"""
+        pages = load_json(pages_file)["pages"]
+        with np.load(arrays_file, allow_pickle=False) as data:
+            return cls(pages, data["page_idx"], data["flags"])
+
+    def __len__(self) -> int:
+        return len(self.page_idx)
+
+    def __getitem__(self, idx):  # type: ignore[override]
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        # Copy so callers cannot mutate the row shared by all chunks of the page
+        meta = dict(self.pages[self.page_idx[idx]])
+        bits = int(self.flags[idx])
+        for bit, flag in enumerate(PAGE_CHUNK_FLAGS):
+            meta[flag] = bool(bits >> bit & 1)
+        return meta
+
+    def section_chunks(self, pattern: str) -> np.ndarray:
+        """Chunk indices, in chunk order, whose page section contains pattern
+
+        Only the distinct section names are scanned; their chunk lists are grouped once.
+        """
+        if self._section_chunks is None:
+            sections, codes = np.unique(
+                np.array([page["section"] for page in self.pages], dtype=str), return_inverse=True
+            )
+            chunk_codes = codes[self.page_idx]
+            order = np.argsort(chunk_codes, kind="stable")
+            bounds = np.searchsorted(chunk_codes[order], np.arange(len(sections) + 1))
+            self._section_chunks = {
+                str(section): order[bounds[i] : bounds[i + 1]] for i, section in enumerate(sections)
+            }
+
+        matches = [ids for section, ids in self._section_chunks.items() if pattern in section]
+        if not matches:
+            return np.empty(0, dtype=np.int64)
+        return matches[0] if len(matches) == 1 else np.sort(np.concatenate(matches))
+
+    def _build_filter_columns(self) -> None:
+        """Build the per-page source and filter flag columns"""
+        if self._sources is not None:
+            return
+
+        self._sources = np.array([page.get("source", "MPEP") for page in self.pages], dtype=str)
+        self._page_flags = {
+            field: np.fromiter(
+                (bool(page.get(field, False)) for page in self.pages),
+                dtype=bool,
+                count=len(self.pages),
+            )
+            for field in PAGE_FILTER_FLAGS
+        }
+
+    def filter_mask(
+        self,
+        chunk_idx: Optional[np.ndarray] = None,
+        source: Optional[str] = None,
+        **flags: Optional[bool],
+    ) -> np.ndarray:
+        """Boolean mask of the chunks that pass the source and flag filters
+
+        Args:
+            chunk_idx: Chunk indices to test (all chunks when None)
+            source: Keep chunks from this source ("MPEP", "35_USC", "37_CFR", "SUBSEQUENT")
+            **flags: PAGE_FILTER_FLAGS fields to match (None values are ignored)
+
+        Returns:
+            Boolean array aligned with chunk_idx
+        """
+        self._build_filter_columns()
+
+        # Filters are page-level: evaluate once per page, then gather per chunk
+        keep = np.ones(len(self.pages), dtype=bool)
+        if source:
+            keep &= self._sources == source
+        for field, value in flags.items():
+            if value is not None:
+                keep &= self._page_flags[field] == value
+
+        return keep[self.page_idx if chunk_idx is None else self.page_idx[chunk_idx]]
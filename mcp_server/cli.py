@@ -36,6 +36,7 @@ from mcp_server.server import (
     extract_mpep_pdfs,
     mcp,
 )
+from mcp_server.utils.json_io import load_json
 
 # Import path utilities for cross-platform path handling
 try:
@@ -380,15 +381,12 @@ def status_command(_args):
     if index_exists:
         metadata_file = INDEX_DIR / "mpep_metadata.json"
         if metadata_file.exists():
-            import json
-
-            with metadata_file.open(encoding="utf-8") as f:
-                data = json.load(f)
-                print(f"  Chunks:    {len(data['chunks']):,}", file=sys.stderr)
-                print(
-                    f"  Sections:  {len({m['section'] for m in data['metadata']}):,}",
-                    file=sys.stderr,
-                )
+            data = load_json(metadata_file)
+            # Indexes saved before the compact layout keep one metadata dict per chunk
+            records = data.get("pages", data.get("metadata", []))
+            num_chunks = data.get("num_chunks", len(data.get("chunks", [])))
+            print(f"  Chunks:    {num_chunks:,}", file=sys.stderr)
+            print(f"  Sections:  {len({m['section'] for m in records}):,}", file=sys.stderr)
 
     print("\nStorage:", file=sys.stderr)
     print(f"  Location:  {MPEP_DIR.absolute()}", file=sys.stderr)
@@ -534,12 +532,15 @@ def patents_status_command(_args):
     if index_exists:
         metadata_file = PATENT_INDEX_DIR / "patent_metadata.json"
         if metadata_file.exists():
-            with metadata_file.open(encoding="utf-8") as f:
-                data = json.load(f)
-                num_chunks = len(data["chunks"])
+            data = load_json(metadata_file)
+            if "patents" in data:
+                num_chunks = data["num_chunks"]
+                num_patents = len(data["patents"])
+            else:  # Per-chunk layout, converted on next index load
+                num_chunks = len(data["metadata"])
                 num_patents = len({m["patent_id"] for m in data["metadata"]})
-                print(f"  Patents: {num_patents:,}", file=sys.stderr)
-                print(f"  Chunks: {num_chunks:,}", file=sys.stderr)
+            print(f"  Patents: {num_patents:,}", file=sys.stderr)
+            print(f"  Chunks: {num_chunks:,}", file=sys.stderr)
 
     print(f"\nIndex Location: {PATENT_INDEX_DIR}", file=sys.stderr)
 
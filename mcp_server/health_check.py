@@ -4,7 +4,9 @@ System Health Checker for Utility Patent Reviewer
 Provides comprehensive pre-flight dependency validation
 """
 
+import json
 import os
+import re
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +20,22 @@ except ImportError:
     INDEX_DIR = Path(__file__).parent / "index"
     MPEP_DIR = Path(__file__).parent.parent / "pdfs"
 
+# PageMetadata.save writes num_chunks as the last key of the page table
+_NUM_CHUNKS_TAIL = re.compile(rb'"num_chunks"\s*:\s*(\d+)\s*}\s*$')
+
+
+def _read_num_chunks(metadata_file: Path) -> int:
+    """Chunk count recorded in an MPEP metadata file, reading only its last bytes"""
+    with metadata_file.open("rb") as f:
+        f.seek(max(0, metadata_file.stat().st_size - 64))
+        match = _NUM_CHUNKS_TAIL.search(f.read())
+    if match:
+        return int(match.group(1))
+
+    # Indexes saved before the compact layout keep one metadata dict per chunk
+    with metadata_file.open(encoding="utf-8") as f:
+        return len(json.load(f).get("metadata", []))
+
 
 class SystemHealthChecker:
     """Comprehensive dependency and readiness validation"""
@@ -83,21 +101,17 @@ class SystemHealthChecker:
 
         # Check index integrity
         try:
-            import json
-
-            import faiss
+            from mcp_server.utils.faiss_utils import read_index_mmap
 
-            index = faiss.read_index(str(index_file))
+            index = read_index_mmap(index_file)
             chunk_count = index.ntotal
-
-            with metadata_file.open(encoding="utf-8") as f:
-                metadata = json.load(f)
+            metadata_entries = _read_num_chunks(metadata_file)
 
             return {
                 "status": "ready",
                 "ready": True,
                 "chunks": chunk_count,
-                "metadata_entries": len(metadata.get("metadata", [])),
+                "metadata_entries": metadata_entries,
                 "size_mb": round(index_file.stat().st_size / (1024**2), 2),
                 "last_modified": datetime.fromtimestamp(index_file.stat().st_mtime).isoformat(),
             }
@@ -135,9 +149,9 @@ class SystemHealthChecker:
             }
 
         try:
-            import faiss
+            from mcp_server.utils.faiss_utils import read_index_mmap
 
-            index = faiss.read_index(str(index_file))
+            index = read_index_mmap(index_file)
             patent_count = index.ntotal
 
             return {
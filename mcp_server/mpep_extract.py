@@ -0,0 +1,159 @@
+"""MPEP PDF text extraction and chunking
+
+Module-level functions with no model state, so spawned extraction worker
+processes can import and run them. This module itself imports only PyMuPDF.
+"""
+
+import re
+import sys
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any
+
+import fitz  # PyMuPDF
+
+# Cross-references detected in every chunk, found in one pass per page. The
+# lookahead makes each match zero-width so references never hide each other, and
+# matching up to the first digit is enough to tell whether a chunk contains one
+_CROSS_REF = re.compile(
+    r"(?=(?P<mpep>MPEP\s*§?\s*\d)"
+    r"|(?P<usc>35 U\.?S\.?C\.?\s*§?\s*\d)"
+    r"|(?P<cfr>37 C\.?F\.?R\.?\s*§?\s*\d))"
+)
+
+
+def _cross_ref_spans(text: str) -> dict[str, tuple[list[int], list[int]]]:
+    """Start and end offsets of each cross-reference kind in text, in order"""
+    spans: dict[str, tuple[list[int], list[int]]] = {
+        kind: ([], []) for kind in ("mpep", "usc", "cfr")
+    }
+    for match in _CROSS_REF.finditer(text):
+        kind = match.lastgroup
+        starts, ends = spans[kind]
+        starts.append(match.start())
+        ends.append(match.end(kind))
+    return spans
+
+
+def _has_ref(span: tuple[list[int], list[int]], start: int, end: int) -> bool:
+    """Whether a reference lies entirely within text[start:end]
+
+    References of one kind cannot nest, so the first one starting at or after start
+    is also the first to end.
+    """
+    starts, ends = span
+    i = bisect_left(starts, start)
+    return i < len(starts) and ends[i] <= end
+
+
+def section_from_filename(filename: str) -> str:
+    """Extract MPEP section number from filename"""
+    # mpep-0100.pdf -> MPEP 100
+    # mpep-2100.pdf -> MPEP 2100
+    parts = filename.replace(".pdf", "").split("-")
+    if len(parts) > 1:
+        section = parts[1]
+        if section.startswith("0") and len(section) == 4:
+            section = section.lstrip("0") or "0"
+        return f"MPEP {section}"
+    return filename
+
+
+def chunk_text_with_metadata(
+    text: str,
+    section_label: str,
+    base_metadata: dict[str, Any],
+    chunk_size: int = 500,
+    overlap: int = 100,
+    min_chunk_length: int = 50,
+) -> list[dict[str, Any]]:
+    """
+    Common helper to chunk text and attach metadata with cross-reference detection.
+
+    Args:
+        text: Raw text to chunk
+        section_label: Label to prepend (e.g., "MPEP 100", "35 U.S.C. §101")
+        base_metadata: Base metadata dict to include in all chunks
+        chunk_size: Characters per chunk
+        overlap: Overlapping characters between chunks
+        min_chunk_length: Minimum chunk length to keep
+
+    Returns:
+        List of chunk dictionaries with text and metadata
+    """
+    # Slice every window up front; the stride is fixed, so offsets need no bookkeeping
+    offsets = range(0, len(text), chunk_size - overlap)
+    windows = [text[i : i + chunk_size] for i in offsets]
+    base_statute = base_metadata.get("has_statute", False)
+    base_rule_ref = base_metadata.get("has_rule_ref", False)
+
+    # Scan the page for cross-references once; windows look them up by offset
+    refs = _cross_ref_spans(text)
+
+    chunks = []
+    for start, chunk_text in zip(offsets, windows):
+        if len(chunk_text.strip()) < min_chunk_length:
+            continue
+
+        # Prepend section context to chunk
+        contextualized_text = f"[{section_label}] {chunk_text}"
+
+        # Detect cross-references in chunk
+        end = start + len(chunk_text)
+        has_mpep_ref = _has_ref(refs["mpep"], start, end)
+        has_usc_ref = _has_ref(refs["usc"], start, end)
+        has_cfr_ref = _has_ref(refs["cfr"], start, end)
+
+        # Merge base metadata with detected references
+        chunk_metadata = {
+            "text": contextualized_text,
+            **base_metadata,
+            "has_mpep_ref": has_mpep_ref,
+            "has_usc_ref": has_usc_ref,
+            "has_cfr_ref": has_cfr_ref,
+            "has_statute": base_statute or has_usc_ref,
+            "has_rule_ref": base_rule_ref or has_cfr_ref,
+        }
+
+        chunks.append(chunk_metadata)
+
+    return chunks
+
+
+def extract_mpep_pdf(pdf_path: Path) -> list[dict[str, Any]]:
+    """Extract text from an MPEP chapter PDF with contextual metadata
+
+    Module-level (no model state) so it can run in spawned worker processes.
+    """
+    chunks = []
+    doc = None
+    try:
+        doc = fitz.open(pdf_path)
+        section = section_from_filename(pdf_path.name)
+
+        # Load pages by number and keep no reference, so each page is freed
+        # before the next one is parsed
+        for page_num in range(doc.page_count):
+            text = doc.load_page(page_num).get_text("text", sort=False)
+            if text.strip():
+                # Use common chunking helper
+                page_chunks = chunk_text_with_metadata(
+                    text=text,
+                    section_label=section,
+                    base_metadata={
+                        "source": "MPEP",
+                        "file": pdf_path.name,
+                        "page": page_num + 1,
+                        "section": section,
+                        "is_statute": False,
+                        "is_regulation": False,
+                        "is_update": False,
+                    },
+                )
+                chunks.extend(page_chunks)
+    except Exception as e:
+        print(f"Error processing {pdf_path}: {e}", file=sys.stderr)
+    finally:
+        if doc is not None:
+            doc.close()
+    return chunks
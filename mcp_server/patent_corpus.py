@@ -72,6 +72,18 @@ def _safe_int(value: Any, default: int = 0) -> int:
         return default
 
 
+def _fast_int(value: Optional[str]) -> int:
+    """Convert a TSV sequence field to int, skipping _safe_int for plain digit strings.
+
+    Sequence columns are almost always bare digits, so the common case avoids the
+    str()/strip()/try round-trip and only malformed values fall back to _safe_int.
+    """
+    # isdecimal(), not isdigit(): digits such as "²" pass isdigit() but int() rejects them
+    if value and value.isdecimal():
+        return int(value)
+    return _safe_int(value, 0)
+
+
 class PatentTSVParser:
     """Parse PatentsView TSV files"""
 
@@ -203,18 +215,28 @@ class PatentTSVParser:
             with file_path.open(encoding="utf-8", errors="ignore") as f:
                 reader = csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_MINIMAL)
 
+                # Only pay for sort keys when the file actually has the sort column
+                if sort_col and sort_col not in (reader.fieldnames or []):
+                    sort_col = None
+
+                if sort_col is None:
+                    # No ordering needed: group rows directly in file order
+                    for row in reader:
+                        key = row.get(key_col, "").strip()
+                        value = row.get(value_col, "").strip()
+                        if key and value:
+                            result.setdefault(key, []).append(value)
+                    return result
+
                 # Collect all rows
                 rows = []
                 for row in reader:
                     key = row.get(key_col, "").strip()
                     value = row.get(value_col, "").strip()
-                    sort_key = _safe_int(row.get(sort_col), 0) if sort_col else 0
                     if key and value:
-                        rows.append((key, value, sort_key))
+                        rows.append((key, value, _fast_int(row[sort_col])))
 
-                # Sort if needed
-                if sort_col:
-                    rows.sort(key=lambda x: (x[0], x[2]))
+                rows.sort(key=lambda x: (x[0], x[2]))
 
                 # Group by key
                 for key, value, _ in rows:
@@ -240,20 +262,31 @@ class PatentTSVParser:
             with file_path.open(encoding="utf-8", errors="ignore") as f:
                 reader = csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_MINIMAL)
 
+                # Only pay for sort keys when the file actually has the sort column
+                if sort_col and sort_col not in (reader.fieldnames or []):
+                    sort_col = None
+
+                if sort_col is None:
+                    # No ordering needed: group rows directly in file order
+                    for row in reader:
+                        key = row.get(key_col, "").strip()
+                        first = row.get(first_col, "").strip()
+                        last = row.get(last_col, "").strip()
+                        if key and (first or last):
+                            result.setdefault(key, []).append(f"{first} {last}".strip())
+                    return result
+
                 rows = []
                 for row in reader:
                     key = row.get(key_col, "").strip()
                     first = row.get(first_col, "").strip()
                     last = row.get(last_col, "").strip()
-                    sort_key = _safe_int(row.get(sort_col), 0) if sort_col else 0
 
                     if key and (first or last):
                         name = f"{first} {last}".strip()
-                        rows.append((key, name, sort_key))
+                        rows.append((key, name, _fast_int(row[sort_col])))
 
-                # Sort if needed
-                if sort_col:
-                    rows.sort(key=lambda x: (x[0], x[2]))
+                rows.sort(key=lambda x: (x[0], x[2]))
 
                 # Group by key
                 for key, name, _ in rows:
@@ -5,10 +5,12 @@ Builds and searches a local USPTO patent corpus using RAG
 Mirrors MPEPIndex architecture for consistency
 """
 
+import copy
+import hashlib
 import json
-import pickle
 import site
 import sys
+from functools import lru_cache
 from typing import Any, Optional
 
 # CRITICAL: Disable user site-packages BEFORE importing third-party packages
@@ -23,8 +25,8 @@ import numpy as np  # noqa: E402
 
 try:
     import faiss
+    import sentence_transformers  # noqa: F401
     import torch
-    from sentence_transformers import CrossEncoder, SentenceTransformer
 except ImportError:
     print(
         "Missing dependencies. Install with: pip install sentence-transformers faiss-cpu torch",
@@ -32,12 +34,8 @@ except ImportError:
     )
     sys.exit(1)
 
-try:
-    from rank_bm25 import BM25Okapi
-except ImportError:
-    BM25Okapi = None
-    print("BM25 not available. Install with: pip install rank-bm25", file=sys.stderr)
-
+from mcp_server.bm25_index import TOKENIZER, BM25Index, tokenize  # noqa: E402
+from mcp_server.chunk_store import ChunkMetadata, ChunkStore  # noqa: E402
 from mcp_server.hyde import HyDEQueryExpander  # noqa: E402
 from mcp_server.patent_corpus import (  # noqa: E402
     PATENT_INDEX_DIR,
@@ -46,6 +44,22 @@ from mcp_server.patent_corpus import (  # noqa: E402
     PatentTSVParser,
 )
 from mcp_server.utils.device import get_device  # noqa: E402
+from mcp_server.utils.encoding import encode_sorted_by_length  # noqa: E402
+from mcp_server.utils.faiss_utils import (  # noqa: E402
+    create_index,
+    index_to_cpu,
+    index_to_gpu,
+    read_index_mmap,
+    set_nprobe,
+    train_on_sample,
+)
+from mcp_server.utils.json_io import load_json  # noqa: E402
+from mcp_server.utils.models import (  # noqa: E402
+    load_embedding_model,
+    load_reranker,
+    model_variant,
+)
+from mcp_server.utils.query_cache import QueryCache  # noqa: E402
 
 
 class PatentCorpusIndex:
@@ -54,6 +68,30 @@ class PatentCorpusIndex:
     Same architecture as MPEPIndex: FAISS + BM25 + HyDE + Reranking
     """
 
+    # Small corpora use an exhaustive scan over FP16 scalar-quantized vectors
+    # (half the bytes per query of FP32 with negligible cosine recall loss).
+    # Above IVF_MIN_VECTORS switch to IVF-PQ (64 bytes/vector instead of 3 KB,
+    # and each query scans only nprobe lists)
+    FLAT_INDEX_KEY = "SQfp16"
+    IVF_MIN_VECTORS = 1_000_000
+    IVF_INDEX_KEY = "IVF4096,PQ64"
+    IVF_NPROBE = 32
+    TRAIN_SAMPLE_SIZE = 262_144
+
+    # Embeddings are generated and added to FAISS one slice at a time; the first
+    # slice doubles as the training set, and a checkpoint is written every few slices
+    ENCODE_SLICE_SIZE = 262_144
+    CHECKPOINT_EVERY_SLICES = 8
+
+    EMBEDDING_MODEL = "BAAI/bge-base-en-v1.5"
+    QUERY_CACHE_SIZE = 1024
+    RESULT_CACHE_SIZE = 256  # Full search results per (query, top_k, retrieve_k, filters)
+
+    # Rerank only the top RERANK_POOL_FACTOR * top_k candidates when the RRF score at
+    # rank top_k is this many times the score just past that pool
+    RERANK_SKIP_GAP = 1.5
+    RERANK_POOL_FACTOR = 2
+
     def __init__(self, use_hyde: bool = True):
         """
         Initialize patent corpus index
@@ -67,30 +105,46 @@ class PatentCorpusIndex:
         # Index files
         self.faiss_file = self.index_dir / "patent_index.faiss"
         self.metadata_file = self.index_dir / "patent_metadata.json"
-        self.bm25_file = self.index_dir / "patent_bm25.pkl"
+        self.chunks_file = self.index_dir / "patent_chunks.bin"
+        self.chunk_offsets_file = self.index_dir / "patent_chunk_offsets.npy"
+        self.chunk_blocks_file = self.index_dir / "patent_chunk_blocks.npy"
+        self.chunk_meta_file = self.index_dir / "patent_chunk_meta.npz"
+        self.checkpoint_file = self.index_dir / "patent_index.partial.faiss"
+        self.checkpoint_meta_file = self.index_dir / "patent_index.partial.json"
+        self.bm25_file = self.index_dir / "patent_bm25.npz"
 
         # Detect and use GPU if available
         self.device = get_device()
 
         # Models (same as MPEP)
         print("Loading embedding model (BGE-base-en-v1.5)...", file=sys.stderr)
-        self.model = SentenceTransformer("BAAI/bge-base-en-v1.5", device=self.device)
+        self.model = load_embedding_model(self.EMBEDDING_MODEL, self.device)
         self.embedding_dim = 768
 
         # Cross-encoder for reranking (same as MPEP)
         print("Loading reranker (MS-MARCO MiniLM)...", file=sys.stderr)
-        self.reranker = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2", device=self.device)
+        self.reranker = load_reranker("cross-encoder/ms-marco-MiniLM-L-6-v2", self.device)
 
         # HyDE generator
         self.use_hyde = use_hyde
         if use_hyde:
             self.hyde_generator = HyDEQueryExpander()
 
+        # Query embedding / HyDE caches: in-process LRU in front of a persistent store
+        self._query_cache = QueryCache(self.index_dir / "query_cache.sqlite")
+        # Embedding cache keys name the backend/precision the vectors came from
+        self._embedding_key = f"embedding:{self.EMBEDDING_MODEL}:{model_variant(self.model)}"
+        self._encode_query = lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._encode_query_uncached)
+        self._expand_query = lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._expand_query_uncached)
+        # Search results depend on the index, so they are cleared when it is built or loaded
+        self._search = lru_cache(maxsize=self.RESULT_CACHE_SIZE)(self._search_uncached)
+
         # Storage
         self.chunks = []
         self.metadata = []
         self.index = None
         self.bm25 = None
+        self._gpu_resources = None  # Keeps FAISS GPU memory alive while the index is on GPU
 
         # Load index if exists
         if self.faiss_file.exists() and self.metadata_file.exists():
@@ -104,82 +158,38 @@ class PatentCorpusIndex:
         Returns:
             List of (chunk_text, metadata) tuples
         """
-        chunks = []
+        # Patent-level fields are the same for every chunk; each chunk adds only its section
+        base = {
+            "patent_id": patent.patent_id,
+            "cpc_codes": patent.cpc_codes,
+            "filing_date": patent.filing_date,
+            "grant_date": patent.grant_date,
+            "inventors": patent.inventors,
+            "assignee": patent.assignee,
+        }
 
         # 1. Title (always include, often very relevant)
-        title_chunk = f"[TITLE] {patent.title}"
-        chunks.append(
-            (
-                title_chunk,
-                {
-                    "patent_id": patent.patent_id,
-                    "section": "title",
-                    "cpc_codes": patent.cpc_codes,
-                    "filing_date": patent.filing_date,
-                    "grant_date": patent.grant_date,
-                    "inventors": patent.inventors,
-                    "assignee": patent.assignee,
-                },
-            )
-        )
+        chunks = [(f"[TITLE] {patent.title}", {**base, "section": "title"})]
 
         # 2. Abstract (usually <500 chars, keep whole)
         if patent.abstract:
-            abstract_chunk = f"[ABSTRACT] {patent.abstract}"
-            chunks.append(
-                (
-                    abstract_chunk,
-                    {
-                        "patent_id": patent.patent_id,
-                        "section": "abstract",
-                        "cpc_codes": patent.cpc_codes,
-                        "filing_date": patent.filing_date,
-                        "grant_date": patent.grant_date,
-                        "inventors": patent.inventors,
-                        "assignee": patent.assignee,
-                    },
-                )
-            )
+            chunks.append((f"[ABSTRACT] {patent.abstract}", {**base, "section": "abstract"}))
 
         # 3. Claims (each claim separately, most important for prior art)
-        for i, claim in enumerate(patent.claims):
-            claim_num = i + 1
-            claim_chunk = f"[CLAIM {claim_num}] {claim}"
-
+        for claim_num, claim in enumerate(patent.claims, 1):
             chunks.append(
                 (
-                    claim_chunk,
-                    {
-                        "patent_id": patent.patent_id,
-                        "section": f"claim_{claim_num}",
-                        "claim_number": claim_num,
-                        "cpc_codes": patent.cpc_codes,
-                        "filing_date": patent.filing_date,
-                        "grant_date": patent.grant_date,
-                        "inventors": patent.inventors,
-                        "assignee": patent.assignee,
-                    },
+                    f"[CLAIM {claim_num}] {claim}",
+                    {**base, "section": f"claim_{claim_num}", "claim_number": claim_num},
                 )
             )
 
         # 4. Description (chunk into 500-char pieces with 100-char overlap)
         if patent.description:
             desc_chunks = self._chunk_text(patent.description, chunk_size=500, overlap=100)
-            for i, desc_chunk in enumerate(desc_chunks):
-                chunk_text = f"[DESCRIPTION] {desc_chunk}"
+            for i, desc_chunk in enumerate(desc_chunks, 1):
                 chunks.append(
-                    (
-                        chunk_text,
-                        {
-                            "patent_id": patent.patent_id,
-                            "section": f"description_{i+1}",
-                            "cpc_codes": patent.cpc_codes,
-                            "filing_date": patent.filing_date,
-                            "grant_date": patent.grant_date,
-                            "inventors": patent.inventors,
-                            "assignee": patent.assignee,
-                        },
-                    )
+                    (f"[DESCRIPTION] {desc_chunk}", {**base, "section": f"description_{i}"})
                 )
 
         return chunks
@@ -233,6 +243,8 @@ class PatentCorpusIndex:
             return
 
         print("\nBuilding patent corpus index...", file=sys.stderr)
+        self._close_chunks()
+        self._search.cache_clear()
 
         # Check if TSV files are downloaded
         downloader = PatentCorpusDownloader()
@@ -298,21 +310,22 @@ class PatentCorpusIndex:
         # Chunk all patents
         print("\nChunking patents...", file=sys.stderr)
         all_chunks = []
-        all_metadata = []
-
-        for i, patent in enumerate(all_patents):
-            chunks = self.chunk_patent(patent)
-            for chunk_text, metadata in chunks:
-                all_chunks.append(chunk_text)
-                all_metadata.append(metadata)
 
-            if (i + 1) % 1000 == 0:
-                print(f"  Chunked {i + 1}/{len(all_patents)} patents...", file=sys.stderr)
+        def chunk_metadata():
+            # Metadata is folded into the compact layout as it is produced, so the
+            # per-chunk dicts are never all held in memory at once
+            for i, patent in enumerate(all_patents):
+                for chunk_text, metadata in self.chunk_patent(patent):
+                    all_chunks.append(chunk_text)
+                    yield metadata
 
-        print(f"Total chunks: {len(all_chunks)}", file=sys.stderr)
+                if (i + 1) % 1000 == 0:
+                    print(f"  Chunked {i + 1}/{len(all_patents)} patents...", file=sys.stderr)
 
+        self.metadata = ChunkMetadata.from_records(chunk_metadata())
         self.chunks = all_chunks
-        self.metadata = all_metadata
+
+        print(f"Total chunks: {len(all_chunks)}", file=sys.stderr)
 
         # Build FAISS index
         print("\n" + "=" * 60, file=sys.stderr)
@@ -323,16 +336,18 @@ class PatentCorpusIndex:
 
         # Optimize batch size for GPU/CPU
         if self.device == "cuda":
-            # Large batch for GPU (RTX 5090 has 24GB RAM)
-            batch_size = 256
+            # Large batch for GPU (RTX 5090 has 24GB RAM); FP16 halves activation memory
+            batch_size = 512
             gpu_name = torch.cuda.get_device_name(0)
             gpu_memory = torch.cuda.get_device_properties(0).total_memory / 1024**3
             print(f"GPU: {gpu_name} ({gpu_memory:.1f}GB)", file=sys.stderr)
             print(f"Batch size: {batch_size}", file=sys.stderr)
             total_batches = (len(all_chunks) + batch_size - 1) // batch_size
             print(f"Total batches: {total_batches:,}", file=sys.stderr)
-            # Real-world timing: RTX 5090 processes ~1.4s/batch (measured with 17.6M chunks)
-            estimated_seconds = total_batches * 1.4
+            # Real-world timing: RTX 5090 processed ~1.4s per FP32 batch of 256 (measured
+            # with 17.6M chunks); FP16 roughly doubles throughput, so a 512 batch is similar.
+            # Multiple GPUs encode in parallel with near-linear scaling
+            estimated_seconds = total_batches * 1.4 / torch.cuda.device_count()
             estimated_hours = estimated_seconds / 3600
             print(
                 f"Estimated time: ~{estimated_seconds:.0f} seconds ({estimated_hours:.1f} hours) with GPU",
@@ -359,41 +374,27 @@ class PatentCorpusIndex:
         import time
 
         start_time = time.time()
-
-        embeddings = self.model.encode(
-            all_chunks,
-            batch_size=batch_size,
-            show_progress_bar=True,
-            convert_to_numpy=True,
-            device=self.device,
-        )
+        num_encoded = self._add_embeddings(all_chunks, batch_size)
 
         elapsed = time.time() - start_time
         print("-" * 60, file=sys.stderr)
         print(
-            f"✓ Generated {len(embeddings):,} embeddings in {elapsed:.1f} seconds",
+            f"✓ Generated {num_encoded:,} embeddings in {elapsed:.1f} seconds",
             file=sys.stderr,
         )
-        print(f"  Speed: {len(embeddings) / elapsed:.0f} embeddings/sec", file=sys.stderr)
+        print(f"  Speed: {num_encoded / max(elapsed, 1e-9):.0f} embeddings/sec", file=sys.stderr)
 
-        print("Building FAISS index...", file=sys.stderr)
-        self.index = faiss.IndexFlatIP(self.embedding_dim)  # Inner product (cosine similarity)
-
-        # Normalize for cosine similarity
-        faiss.normalize_L2(embeddings)
-        self.index.add(embeddings)  # type: ignore[call-arg]
+        set_nprobe(self.index, self.IVF_NPROBE)
+        self.index, self._gpu_resources = index_to_gpu(self.index, self.device)
 
         print(f"FAISS index built with {self.index.ntotal} vectors", file=sys.stderr)
 
         # Build BM25 index
-        if BM25Okapi:
-            print("Building BM25 index...", file=sys.stderr)
-            tokenized = [chunk.lower().split() for chunk in all_chunks]
-            self.bm25 = BM25Okapi(tokenized)
-            print("BM25 index built", file=sys.stderr)
+        self._build_bm25()
 
         # Save index
         self.save_index()
+        self._remove_checkpoint()
 
         print("\n✓ Patent corpus index built successfully", file=sys.stderr)
         print(f"  Patents: {len(all_patents)}", file=sys.stderr)
@@ -403,58 +404,206 @@ class PatentCorpusIndex:
             file=sys.stderr,
         )
 
+    def _add_embeddings(self, chunks: list[str], batch_size: int) -> int:
+        """Encode chunks slice by slice straight into a new FAISS index
+
+        Only one slice of embeddings is in memory at a time (the full corpus would be
+        ~54 GB of float32). The index is trained on the first slice, and a checkpoint is
+        written every few slices so an interrupted build resumes where it stopped.
+
+        Returns:
+            Number of chunks encoded (excluding any restored from a checkpoint)
+        """
+        self.index = self._load_checkpoint(chunks)
+        if self.index is None:
+            self.index = self._create_faiss_index(len(chunks))
+        start = self.index.ntotal
+        if start:
+            print(f"Resuming from checkpoint at chunk {start:,}", file=sys.stderr)
+
+        pool = self._start_encode_pool()
+        try:
+            slice_starts = range(start, len(chunks), self.ENCODE_SLICE_SIZE)
+            for slice_num, slice_start in enumerate(slice_starts, 1):
+                texts = chunks[slice_start : slice_start + self.ENCODE_SLICE_SIZE]
+
+                # Length-sorted batching: uniform batches waste far less compute on padding
+                # (encode sorts by length itself; the pool path needs a global sort first)
+                with torch.inference_mode():
+                    if pool is not None:
+                        embeddings = encode_sorted_by_length(
+                            self.model, texts, pool, batch_size=batch_size
+                        )
+                    else:
+                        embeddings = self.model.encode(
+                            texts,
+                            batch_size=batch_size,
+                            show_progress_bar=False,
+                            convert_to_numpy=True,
+                            device=self.device,
+                        )
+                # FP16 models return float16; FAISS needs float32
+                embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+                # Normalize for cosine similarity
+                faiss.normalize_L2(embeddings)
+                train_on_sample(self.index, embeddings, self.TRAIN_SAMPLE_SIZE)
+                self.index.add(embeddings)  # type: ignore[call-arg]
+                del embeddings
+
+                print(f"  Encoded {self.index.ntotal:,}/{len(chunks):,} chunks", file=sys.stderr)
+                if slice_num % self.CHECKPOINT_EVERY_SLICES == 0:
+                    self._save_checkpoint(chunks)
+        finally:
+            if pool is not None:
+                self.model.stop_multi_process_pool(pool)
+
+        return len(chunks) - start
+
+    def _start_encode_pool(self):
+        """Start one encoding worker per GPU on multi-GPU hosts (None otherwise)"""
+        if self.device != "cuda" or torch.cuda.device_count() < 2:
+            return None
+
+        devices = [f"cuda:{i}" for i in range(torch.cuda.device_count())]
+        try:
+            pool = self.model.start_multi_process_pool(target_devices=devices)
+        except Exception as e:
+            print(f"Multi-GPU encoding unavailable ({e}), using one GPU", file=sys.stderr)
+            return None
+
+        print(f"Encoding on {len(devices)} GPUs: {', '.join(devices)}", file=sys.stderr)
+        return pool
+
+    @staticmethod
+    def _chunks_fingerprint(chunks: list[str]) -> str:
+        """Cheap identity check so a checkpoint is only resumed for the same chunk list"""
+        digest = hashlib.blake2b(str(len(chunks)).encode("utf-8"), digest_size=16)
+        for chunk in chunks[:: max(1, len(chunks) // 1000)]:
+            digest.update(chunk.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _save_checkpoint(self, chunks: list[str]):
+        """Write the partially built FAISS index for crash-resume"""
+        tmp_file = self.checkpoint_file.with_suffix(".tmp")
+        faiss.write_index(self.index, str(tmp_file))
+        tmp_file.replace(self.checkpoint_file)
+        with self.checkpoint_meta_file.open("w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self._chunks_fingerprint(chunks)}, f)
+        print(f"  Checkpoint saved ({self.index.ntotal:,} vectors)", file=sys.stderr)
+
+    def _load_checkpoint(self, chunks: list[str]):
+        """Return a checkpointed partial index for this chunk list, or None"""
+        if not (self.checkpoint_file.exists() and self.checkpoint_meta_file.exists()):
+            return None
+        try:
+            with self.checkpoint_meta_file.open(encoding="utf-8") as f:
+                if json.load(f).get("fingerprint") != self._chunks_fingerprint(chunks):
+                    print("Ignoring checkpoint from a different corpus", file=sys.stderr)
+                    return None
+            return faiss.read_index(str(self.checkpoint_file))
+        except Exception as e:
+            print(f"Failed to load checkpoint ({e}), starting over", file=sys.stderr)
+            return None
+
+    def _remove_checkpoint(self):
+        """Delete checkpoint files once the full index has been saved"""
+        self.checkpoint_file.unlink(missing_ok=True)
+        self.checkpoint_meta_file.unlink(missing_ok=True)
+
+    def _build_bm25(self):
+        """Build the BM25 keyword index over the loaded chunks"""
+        print("Building BM25 index...", file=sys.stderr)
+        self.bm25 = BM25Index.from_corpus(tokenize(chunk) for chunk in self.chunks)
+        print("BM25 index built", file=sys.stderr)
+
+    def _create_faiss_index(self, num_vectors: int):
+        """Create an empty FAISS index sized for the corpus"""
+        if num_vectors >= self.IVF_MIN_VECTORS:
+            print(
+                f"Using {self.IVF_INDEX_KEY} index for {num_vectors:,} vectors",
+                file=sys.stderr,
+            )
+            return create_index(self.embedding_dim, self.IVF_INDEX_KEY)
+
+        return create_index(self.embedding_dim, self.FLAT_INDEX_KEY)
+
     def save_index(self):
         """Save index to disk"""
         print("Saving index...", file=sys.stderr)
 
-        # Save FAISS index
-        faiss.write_index(self.index, str(self.faiss_file))
+        # Save FAISS index (GPU indices are copied back to CPU for serialization)
+        faiss.write_index(index_to_cpu(self.index), str(self.faiss_file))
 
-        # Save metadata
-        with self.metadata_file.open("w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "chunks": self.chunks,
-                    "metadata": self.metadata,
-                },
-                f,
-            )
+        # Save chunk texts (compressed, memory-mapped on load) and metadata
+        ChunkStore.write(
+            self.chunks, self.chunks_file, self.chunk_offsets_file, self.chunk_blocks_file
+        )
+        self.metadata.save(self.metadata_file, self.chunk_meta_file)
 
         # Save BM25 index
         if self.bm25:
-            with self.bm25_file.open("wb") as f:
-                pickle.dump(self.bm25, f)
+            self.bm25.save(self.bm25_file)
 
         print("Index saved", file=sys.stderr)
 
+    def _close_chunks(self):
+        """Unmap the loaded chunk store so its files can be reopened or rewritten"""
+        if isinstance(self.chunks, ChunkStore):
+            self.chunks.close()
+        self.chunks = []
+
     def load_index(self):
         """Load index from disk"""
         print("Loading patent index...", file=sys.stderr)
+        self._search.cache_clear()
+        self._close_chunks()
 
-        # Load FAISS index
-        self.index = faiss.read_index(str(self.faiss_file))
+        # Load FAISS index (memory-mapped; copied to GPU when available)
+        self.index = read_index_mmap(self.faiss_file)
+        set_nprobe(self.index, self.IVF_NPROBE)
+        self.index, self._gpu_resources = index_to_gpu(self.index, self.device)
 
-        # Load metadata
-        with self.metadata_file.open(encoding="utf-8") as f:
-            data = json.load(f)
-            self.chunks = data["chunks"]
-            self.metadata = data["metadata"]
+        # Load chunk texts and metadata
+        if not self.chunk_meta_file.exists():
+            self._migrate_metadata_json()
+        self.metadata = ChunkMetadata.load(self.metadata_file, self.chunk_meta_file)
+        self.chunks = ChunkStore(self.chunks_file, self.chunk_offsets_file, self.chunk_blocks_file)
 
         # Load BM25 index
-        if BM25Okapi and self.bm25_file.exists():
-            try:
-                # Note: pickle is only used for locally-generated index files (trusted source)
-                with self.bm25_file.open("rb") as f:
-                    self.bm25 = pickle.load(f)  # nosec B301 - loading trusted local index
-                print("Hybrid search enabled", file=sys.stderr)
-            except Exception as e:
-                print(f"Failed to load BM25 index: {e}", file=sys.stderr)
+        try:
+            if self.bm25_file.exists():
+                self.bm25 = BM25Index.load(self.bm25_file)
+            # Rebuild once for indexes that only have the old pickle or another tokenizer
+            if self.bm25 is None or self.bm25.tokenizer != TOKENIZER:
+                self._build_bm25()
+                self.bm25.save(self.bm25_file)
+            print("Hybrid search enabled", file=sys.stderr)
+        except Exception as e:
+            print(f"Failed to load BM25 index: {e}", file=sys.stderr)
 
         print(
-            f"Loaded {len(self.chunks)} chunks from {len({m['patent_id'] for m in self.metadata})} patents",
+            f"Loaded {len(self.chunks)} chunks from {len(self.metadata.patents)} patents",
             file=sys.stderr,
         )
 
+    def _migrate_metadata_json(self):
+        """Convert an index saved with one metadata dict per chunk to the split layout"""
+        print("Converting patent metadata to the compact layout...", file=sys.stderr)
+        data = load_json(self.metadata_file)
+
+        # The oldest layout also kept the chunk texts in the same JSON
+        if "chunks" in data:
+            ChunkStore.write(
+                data.pop("chunks"),
+                self.chunks_file,
+                self.chunk_offsets_file,
+                self.chunk_blocks_file,
+            )
+        ChunkMetadata.from_records(data.pop("metadata")).save(
+            self.metadata_file, self.chunk_meta_file
+        )
+
     def search(
         self,
         query: str,
@@ -471,113 +620,110 @@ class PatentCorpusIndex:
             top_k: Number of final results after reranking
             retrieve_k: Number of candidates before reranking (default: top_k * 4)
             cpc_filter: Filter by CPC code prefix (e.g., "G06F" for computing)
-            date_range: Filter by date range (grant_date: "YYYYMMDD", "YYYYMMDD")
+            date_range: Filter by grant date range ("YYYYMMDD", "YYYYMMDD"), inclusive;
+                partial "YYYY" / "YYYY-MM" bounds cover the whole year or month
 
         Returns:
-            List of relevant patent chunks with scores
+            List of relevant patent chunks with scores (memoized until the index is rebuilt;
+            each call returns fresh copies)
         """
         if self.index is None:
             raise ValueError("Index not built. Run build_index() first.")
 
         retrieve_k = min(top_k * 4, 50) if retrieve_k is None else min(retrieve_k, 100)
+        date_range = tuple(date_range) if date_range else None
+
+        # Deep copies, so callers that edit a result do not corrupt the cached one
+        return copy.deepcopy(
+            list(self._search(query.strip(), top_k, retrieve_k, cpc_filter, date_range))
+        )
+
+    def search_cache_info(self) -> dict[str, Any]:
+        """Hits, misses and size of the search result cache"""
+        return self._search.cache_info()._asdict()
+
+    def _search_uncached(
+        self,
+        query: str,
+        top_k: int,
+        retrieve_k: int,
+        cpc_filter: Optional[str],
+        date_range: Optional[tuple[str, str]],
+    ) -> list[dict[str, Any]]:
+        """Run the hybrid search (arguments already validated and capped by search)"""
 
         # Apply HyDE if enabled
         search_query = query
         if self.use_hyde:
-            expansions = self.hyde_generator.expand_query(query, num_expansions=2)
+            expansions = self._expand_query(query)
             if len(expansions) > 1:
                 # Use the hypothetical document (not the original query)
                 search_query = expansions[1]
                 print("HyDE expanded query", file=sys.stderr)
 
         # Vector search
-        query_embedding = self.model.encode([search_query], convert_to_numpy=True)
-        faiss.normalize_L2(query_embedding)
-
-        distances, indices = self.index.search(query_embedding, retrieve_k * 2)  # type: ignore[call-arg]
-        vector_scores = distances[0]
-        vector_indices = indices[0]
-
-        # BM25 keyword search
-        bm25_scores = None
+        query_embedding = self._encode_query(search_query)
+        _, indices = self.index.search(query_embedding, retrieve_k * 2)  # type: ignore[call-arg]
+        num_chunks = len(self.chunks)
+
+        # Vector ranks (1-based; invalid -1 slots still consume a rank)
+        vector_ids = indices[0].astype(np.int64)
+        vector_ranks = np.arange(1, len(vector_ids) + 1)
+        valid = (vector_ids >= 0) & (vector_ids < num_chunks)
+        vector_ids, vector_ranks = vector_ids[valid], vector_ranks[valid]
+
+        # BM25 keyword search (top retrieve_k * 2 by partial sort)
+        bm25_ids = np.empty(0, dtype=np.int64)
         if self.bm25:
-            tokenized_query = search_query.lower().split()
-            bm25_scores = self.bm25.get_scores(tokenized_query)
-
-        # Combine results with RRF (Reciprocal Rank Fusion)
-        candidates = {}
+            bm25_ids, _ = self.bm25.top_k(tokenize(search_query), retrieve_k * 2)
+        bm25_ranks = np.arange(1, len(bm25_ids) + 1)
 
-        # Add vector results
-        for rank, (idx, score) in enumerate(zip(vector_indices, vector_scores)):
-            if 0 <= idx < len(self.chunks):  # Valid index
-                candidates[int(idx)] = {
-                    "text": self.chunks[idx],
-                    "metadata": self.metadata[idx],
-                    "vector_score": float(score),
-                    "vector_rank": rank + 1,
-                }
-
-        # Add BM25 results
-        if bm25_scores is not None:
-            bm25_ranked = np.argsort(bm25_scores)[::-1][: retrieve_k * 2]
-            for rank, idx in enumerate(bm25_ranked):
-                if idx < 0 or idx >= len(self.chunks):
-                    continue
-                if idx in candidates:
-                    candidates[idx]["bm25_score"] = float(bm25_scores[idx])
-                    candidates[idx]["bm25_rank"] = rank + 1
-                else:
-                    candidates[int(idx)] = {
-                        "text": self.chunks[idx],
-                        "metadata": self.metadata[idx],
-                        "bm25_score": float(bm25_scores[idx]),
-                        "bm25_rank": rank + 1,
-                    }
+        # Combine results with RRF (Reciprocal Rank Fusion) over the candidate ids only
+        k_rrf = 60
+        cand_ids, inverse = np.unique(np.concatenate([vector_ids, bm25_ids]), return_inverse=True)
+        rrf_scores = np.bincount(
+            inverse,
+            weights=1.0 / (k_rrf + np.concatenate([vector_ranks, bm25_ranks])),
+            minlength=len(cand_ids),
+        )
 
         # Apply filters
         if cpc_filter or date_range:
-            filtered_candidates = {}
-            for idx, cand in candidates.items():
-                meta = cand["metadata"]
-
-                # CPC filter
-                if cpc_filter:
-                    cpc_codes = meta.get("cpc_codes", [])
-                    if not any(code.startswith(cpc_filter) for code in cpc_codes):
-                        continue
-
-                # Date range filter
-                if date_range:
-                    grant_date = meta.get("grant_date", "")
-                    if grant_date:
-                        grant_date_clean = grant_date.replace("-", "")
-                        start_date, end_date = date_range
-                        if not (start_date <= grant_date_clean <= end_date):
-                            continue
-
-                filtered_candidates[idx] = cand
-
-            candidates = filtered_candidates
-
-        # Compute RRF scores
-        k_rrf = 60
-        for cand in candidates.values():
-            rrf_score = 0.0
-            if "vector_rank" in cand:
-                rrf_score += 1.0 / (k_rrf + cand["vector_rank"])
-            if "bm25_rank" in cand:
-                rrf_score += 1.0 / (k_rrf + cand["bm25_rank"])
-            cand["rrf_score"] = rrf_score
-
-        # Sort by RRF and take top candidates
-        sorted_candidates = sorted(candidates.values(), key=lambda x: x["rrf_score"], reverse=True)[
-            :retrieve_k
+            keep = self.metadata.filter_mask(cand_ids, cpc_filter, date_range)
+            cand_ids, rrf_scores = cand_ids[keep], rrf_scores[keep]
+
+        # Take top candidates by RRF; only these are materialized
+        top = np.argsort(-rrf_scores, kind="stable")[:retrieve_k]
+        sorted_candidates = [
+            {
+                "text": self.chunks[idx],
+                "metadata": self.metadata[idx],
+                "rrf_score": float(rrf_scores[i]),
+            }
+            for i, idx in zip(top, cand_ids[top])
         ]
 
+        # Smaller rerank pool: when the top_k RRF scores clearly dominate the tail, the
+        # cross-encoder scores only a pool of RERANK_POOL_FACTOR * top_k candidates.
+        # RRF scores are coarse (1/61 vs 2/61 just means one list vs both), so the pool
+        # keeps room for reranking to promote near-misses past the top_k
+        pool = top_k * self.RERANK_POOL_FACTOR
+        if 0 < pool < len(sorted_candidates):
+            boundary = sorted_candidates[pool]["rrf_score"]
+            gap = sorted_candidates[top_k - 1]["rrf_score"] / max(boundary, 1e-9)
+            if gap > self.RERANK_SKIP_GAP:
+                sorted_candidates = sorted_candidates[:pool]
+
         # Cross-encoder reranking
         if len(sorted_candidates) > 0:
             pairs = [[query, cand["text"]] for cand in sorted_candidates]
-            rerank_scores = self.reranker.predict(pairs)
+            # All candidates in one forward pass (predict defaults to batches of 32)
+            rerank_scores = self.reranker.predict(
+                pairs,
+                batch_size=len(pairs),
+                show_progress_bar=False,
+                convert_to_numpy=True,
+            )
 
             for cand, score in zip(sorted_candidates, rerank_scores):
                 cand["rerank_score"] = float(score)
@@ -604,16 +750,41 @@ class PatentCorpusIndex:
 
         return results
 
+    def _encode_query_uncached(self, query: str) -> np.ndarray:
+        """Normalized float32 query embedding (read-only; shared through the caches)"""
+        key = f"{self._embedding_key}:{query}"
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return np.frombuffer(cached, dtype=np.float32).reshape(1, -1)
+
+        embedding = self.model.encode([query], convert_to_numpy=True)
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32)
+        faiss.normalize_L2(embedding)
+        self._query_cache.set(key, embedding.tobytes())
+        embedding.setflags(write=False)
+        return embedding
+
+    def _expand_query_uncached(self, query: str) -> tuple[str, ...]:
+        """HyDE expansions of a query (API/local backends make a model call per query)"""
+        key = f"hyde:{self.hyde_generator.backend}:{query}"
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return tuple(json.loads(cached))
+
+        expansions = self.hyde_generator.expand_query(query, num_expansions=2)
+        self._query_cache.set(key, json.dumps(expansions).encode("utf-8"))
+        return tuple(expansions)
+
     def get_patent_chunks(self, patent_id: str) -> list[dict[str, Any]]:
         """Get all chunks for a specific patent"""
         chunks = []
-        for chunk, meta in zip(self.chunks, self.metadata):
-            if meta["patent_id"] == patent_id:
-                chunks.append(
-                    {
-                        "text": chunk,
-                        "section": meta["section"],
-                        "metadata": meta,
-                    }
-                )
+        for idx in self.metadata.chunks_for_patent(patent_id):
+            meta = self.metadata[idx]
+            chunks.append(
+                {
+                    "text": self.chunks[idx],
+                    "section": meta["section"],
+                    "metadata": meta,
+                }
+            )
         return chunks
@@ -6,10 +6,206 @@ Handles Windows, Linux, macOS path formatting for different shells
 
 import os
 import platform
+import re
 import shlex
+import stat
+import sys
+from collections.abc import Iterable
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
 
+# The platform cannot change within a process
+_SYSTEM = platform.system()
+_IS_WINDOWS = _SYSTEM == "Windows"
+
+# Characters that force quoting in bash (one C-level scan instead of one per character)
+_BASH_SPECIAL = re.compile(r"[\s&|;()<>]")
+
+# Windows drive prefix ("C:\\" or "C:/"), rewritten to Git Bash's "/c/"
+_WIN_DRIVE = re.compile(r"^([A-Za-z]):[\\/]")
+
+
+# PowerShell escapes an embedded double quote with a backtick
+_PS_ESCAPE = str.maketrans({'"': '`"'})
+
+
+def _drive_to_posix(match: re.Match) -> str:
+    return f"/{match.group(1).lower()}/"
+
+
+# "." / ".." path segments or doubled separators, which normalization would collapse
+_DOT_SEGMENT = re.compile(r"[\\/]\.{1,2}(?:[\\/]|$)|[\\/]{2}")
+_PATH_SEPARATORS = re.compile(r"[\\/]")
+
+
+def _looks_resolved(path_str: str) -> bool:
+    """Cheap check that a path string is already absolute and clean
+
+    Used by _normalize_for_shell() to skip even the abspath() split/join.
+    """
+    if _IS_WINDOWS:
+        # "C:\\..." with backslashes only (normalization would rewrite forward slashes)
+        if len(path_str) < 3 or path_str[1:3] != ":\\" or "/" in path_str:
+            return False
+    elif not path_str.startswith("/"):
+        return False
+    # Trailing separator (other than the root itself)
+    if len(path_str) > (3 if _IS_WINDOWS else 1) and path_str.endswith(("/", "\\")):
+        return False
+    return _DOT_SEGMENT.search(path_str) is None
+
+
+@lru_cache(maxsize=2048)
+def _resolve(path_str: str) -> str:
+    """Cached Path.resolve() (a stat/readlink walk over every path component)"""
+    # Interned, so every cache (and the formatters that return it unquoted) share
+    # one string object per path
+    return sys.intern(str(Path(path_str).resolve()))
+
+
+def _normalize_for_shell(path_str: str) -> str:
+    """Absolute normalized path for shell quoting (no filesystem walk unless needed)
+
+    Unlike _resolve(), symlinks are kept: a shell command only needs a path that
+    points at the same file, not its canonical target. Paths with a ".." component
+    are resolved, since collapsing ".." textually after a symlinked directory would
+    point somewhere else. PathFormatter.normalize() remains the canonical variant.
+    """
+    if _looks_resolved(path_str):
+        return sys.intern(path_str)
+    if ".." in _PATH_SEPARATORS.split(path_str):
+        return _resolve(path_str)
+    return sys.intern(os.path.abspath(path_str))
+
+
+def _quote_for_bash(path_str: str) -> str:
+    # Quote if contains spaces or special characters
+    if _BASH_SPECIAL.search(path_str):
+        # Single quotes need no escaping inside unless the path itself contains one
+        if "'" not in path_str:
+            return sys.intern(f"'{path_str}'")
+        return sys.intern(shlex.quote(path_str))
+    return path_str
+
+
+# Formatting results are cached per path string: CLI registration formats the same
+# few paths repeatedly, and each uncached call normalizes the path.
+# Relative paths are cached as given, so call _clear_path_caches() after os.chdir()
+@lru_cache(maxsize=1024)
+def _for_bash_posix(path_str: str) -> str:
+    return _quote_for_bash(_normalize_for_shell(path_str))
+
+
+@lru_cache(maxsize=1024)
+def _for_bash_windows(path_str: str) -> str:
+    # Convert Windows paths to POSIX for Git Bash: C:\\Users\\Rob -> /c/Users/Rob
+    path_str = _normalize_for_shell(path_str)
+    path_str = _WIN_DRIVE.sub(_drive_to_posix, path_str, count=1).replace("\\", "/")
+    return _quote_for_bash(sys.intern(path_str))
+
+
+# The platform is fixed per process, so pick the bash formatter once instead of
+# branching on every call
+_for_bash_cached = _for_bash_windows if _IS_WINDOWS else _for_bash_posix
+
+
+@lru_cache(maxsize=1024)
+def _for_powershell_cached(path_str: str) -> str:
+    path_str = _normalize_for_shell(path_str)
+
+    # PowerShell uses double quotes for paths with spaces
+    if " " in path_str:
+        # Escape inner double quotes if any
+        path_str = path_str.translate(_PS_ESCAPE)
+        return sys.intern(f'"{path_str}"')
+    return path_str
+
+
+@lru_cache(maxsize=1024)
+def _for_cmd_cached(path_str: str) -> str:
+    path_str = _normalize_for_shell(path_str)
+
+    # CMD uses double quotes for paths with spaces
+    if " " in path_str:
+        return sys.intern(f'"{path_str}"')
+    return path_str
+
+
+@lru_cache(maxsize=1024)
+def _ensure_posix_cached(path_str: str) -> str:
+    return sys.intern(Path(_resolve(path_str)).as_posix())
+
+
+@lru_cache(maxsize=4096)
+def _normalize_cached(path_str: str) -> Path:
+    # Path objects are immutable, so one instance can be shared by every caller
+    return Path(_resolve(path_str))
+
+
+@lru_cache(maxsize=64)
+def _format_for_claude_mcp_cached(python_str: str, script_str: str) -> tuple[str, str]:
+    # MCP registration uses POSIX-style paths even on Windows
+    return _ensure_posix_cached(python_str), _ensure_posix_cached(script_str)
+
+
+def _clear_path_caches() -> None:
+    """Drop cached path resolution and formatting results (e.g. after os.chdir() or in tests)"""
+    _resolve.cache_clear()
+    _for_bash_cached.cache_clear()
+    _for_powershell_cached.cache_clear()
+    _for_cmd_cached.cache_clear()
+    _ensure_posix_cached.cache_clear()
+    _format_for_claude_mcp_cached.cache_clear()
+    _normalize_cached.cache_clear()
+
+
+# $SHELL executable name -> shell type
+_SHELL_MAP = {
+    "bash": "bash",
+    "zsh": "zsh",
+    "fish": "fish",
+    "sh": "sh",
+    "dash": "sh",
+    "ash": "sh",
+    "ksh": "sh",
+}
+
+
+def _detect_shell_type() -> str:
+    """Detect the shell type from environment variables (see PathFormatter.get_shell_type)"""
+    # Check environment variables
+    if os.getenv("MSYSTEM"):
+        return "git-bash"
+    if os.getenv("WSL_DISTRO_NAME"):
+        return "wsl"
+    if os.getenv("PSMODULEPATH"):
+        return "powershell"
+
+    # Check SHELL environment variable (Linux/macOS) by executable name, so a
+    # directory like /home/bash-user/bin/zsh is not mistaken for bash
+    name = os.path.basename(os.getenv("SHELL", "")).lower()
+    if name.endswith(".exe"):
+        name = name[:-4]
+
+    # Default based on platform (assume bash on *nix systems)
+    return _SHELL_MAP.get(name, "cmd" if _IS_WINDOWS else "bash")
+
+
+def refresh_shell_detection() -> None:
+    """Re-read the shell environment variables (e.g. in tests that modify os.environ)"""
+    global _USE_BASH, _USE_PS, _SHELL_TYPE
+    _USE_BASH = bool(os.getenv("MSYSTEM") or os.getenv("WSL_DISTRO_NAME"))
+    _USE_PS = bool(os.getenv("PSMODULEPATH"))
+    _SHELL_TYPE = _detect_shell_type()
+
+
+# The shell environment does not change within a process, so probe it once at import
+_USE_BASH = False
+_USE_PS = False
+_SHELL_TYPE = "unknown"
+refresh_shell_detection()
+
 
 class PathFormatter:
     """Cross-platform path formatting and quoting for various shells"""
@@ -24,22 +220,7 @@ class PathFormatter:
             /home/user/file.txt -> /home/user/file.txt
             "path with spaces" -> 'path with spaces'
         """
-        path_str = str(Path(path).resolve())
-
-        # Convert Windows paths to POSIX for Git Bash
-        if platform.system() == "Windows":
-            # C:\\Users\\Rob -> /c/Users/Rob
-            if len(path_str) >= 3 and path_str[1] == ":":
-                drive = path_str[0].lower()
-                rest = path_str[3:].replace("\\", "/")
-                path_str = f"/{drive}/{rest}"
-            else:
-                path_str = path_str.replace("\\", "/")
-
-        # Quote if contains spaces or special characters
-        if " " in path_str or any(c in path_str for c in ["&", "|", ";", "(", ")", "<", ">"]):
-            return shlex.quote(path_str)
-        return path_str
+        return _for_bash_cached(os.fspath(path))
 
     @staticmethod
     def for_powershell(path: Union[str, Path]) -> str:
@@ -50,14 +231,7 @@ class PathFormatter:
             C:\\Users\\Rob\\file.txt -> "C:\\Users\\Rob\\file.txt" (if spaces)
             C:\\Users\\file.txt -> C:\\Users\\file.txt (no spaces)
         """
-        path_str = str(Path(path).resolve())
-
-        # PowerShell uses double quotes for paths with spaces
-        if " " in path_str:
-            # Escape inner double quotes if any
-            path_str = path_str.replace('"', '`"')
-            return f'"{path_str}"'
-        return path_str
+        return _for_powershell_cached(os.fspath(path))
 
     @staticmethod
     def for_cmd(path: Union[str, Path]) -> str:
@@ -68,12 +242,7 @@ class PathFormatter:
             C:\\Users\\Rob\\file.txt -> "C:\\Users\\Rob\\file.txt" (if spaces)
             C:\\Users\\file.txt -> C:\\Users\\file.txt (no spaces)
         """
-        path_str = str(Path(path).resolve())
-
-        # CMD uses double quotes for paths with spaces
-        if " " in path_str:
-            return f'"{path_str}"'
-        return path_str
+        return _for_cmd_cached(os.fspath(path))
 
     @staticmethod
     def auto_format(path: Union[str, Path]) -> str:
@@ -88,16 +257,15 @@ class PathFormatter:
         - Bash/sh (Linux/macOS)
         """
         # Check for Git Bash or WSL
-        if os.getenv("MSYSTEM") or os.getenv("WSL_DISTRO_NAME"):
+        if _USE_BASH:
             return PathFormatter.for_bash(path)
 
         # Check for PowerShell
-        if os.getenv("PSMODULEPATH"):
+        if _USE_PS:
             return PathFormatter.for_powershell(path)
 
         # Check platform
-        system = platform.system()
-        if system == "Windows":
+        if _IS_WINDOWS:
             # Likely CMD if we got here
             return PathFormatter.for_cmd(path)
         else:
@@ -111,7 +279,7 @@ class PathFormatter:
 
         Returns Path object that works consistently across platforms
         """
-        return Path(path).resolve()
+        return _normalize_cached(os.fspath(path))
 
     @staticmethod
     def ensure_posix_str(path: Union[str, Path]) -> str:
@@ -120,37 +288,18 @@ class PathFormatter:
 
         Useful for URLs, JSON, and cross-platform storage
         """
-        return str(Path(path).resolve()).replace("\\", "/")
+        return _ensure_posix_cached(os.fspath(path))
 
     @staticmethod
     def get_shell_type() -> str:
         """
         Detect current shell type
 
-        Returns: "bash", "powershell", "cmd", "git-bash", "wsl", "zsh", "sh", "unknown"
+        Returns: "bash", "powershell", "cmd", "git-bash", "wsl", "zsh", "sh", "fish", "unknown"
+
+        Detected once at import; call refresh_shell_detection() after changing the environment.
         """
-        # Check environment variables
-        if os.getenv("MSYSTEM"):
-            return "git-bash"
-        if os.getenv("WSL_DISTRO_NAME"):
-            return "wsl"
-        if os.getenv("PSMODULEPATH"):
-            return "powershell"
-
-        # Check SHELL environment variable (Linux/macOS)
-        shell = os.getenv("SHELL", "").lower()
-        if "bash" in shell:
-            return "bash"
-        if "zsh" in shell:
-            return "zsh"
-        if "sh" in shell and "bash" not in shell:
-            return "sh"
-
-        # Default based on platform
-        if platform.system() == "Windows":
-            return "cmd"
-        else:
-            return "bash"  # Assume bash on *nix systems
+        return _SHELL_TYPE
 
     @staticmethod
     def format_for_claude_mcp(
@@ -161,11 +310,7 @@ class PathFormatter:
 
         Returns: (python_str, script_str) formatted appropriately
         """
-        # MCP registration uses POSIX-style paths even on Windows
-        python_str = PathFormatter.ensure_posix_str(python_path)
-        script_str = PathFormatter.ensure_posix_str(script_path)
-
-        return python_str, script_str
+        return _format_for_claude_mcp_cached(os.fspath(python_path), os.fspath(script_path))
 
 
 class PathValidator:
@@ -178,15 +323,17 @@ class PathValidator:
 
         Returns: (is_valid, error_message)
         """
-        path_obj = Path(path)
-
-        if not path_obj.exists():
+        # One stat() answers exists / is-file (instead of two syscalls)
+        try:
+            mode = os.stat(path).st_mode
+        except OSError:
             return False, f"File not found: {path}"
 
-        if not path_obj.is_file():
+        if not stat.S_ISREG(mode):
             return False, f"Not a file: {path}"
 
-        if not os.access(path_obj, os.X_OK) and platform.system() != "Windows":
+        # Executable by this process, not just by someone (Windows has no execute permission)
+        if not _IS_WINDOWS and not os.access(path, os.X_OK):
             return False, f"Not executable: {path}"
 
         return True, ""
@@ -198,16 +345,72 @@ class PathValidator:
 
         Returns: (is_valid, error_message)
         """
-        path_obj = Path(path)
-
-        if must_exist and not path_obj.exists():
-            return False, f"Directory not found: {path}"
-
-        if path_obj.exists() and not path_obj.is_dir():
+        try:
+            mode = os.stat(path).st_mode
+        except OSError:
+            if must_exist:
+                return False, f"Directory not found: {path}"
+            return True, ""
+
+        if not stat.S_ISDIR(mode):
             return False, f"Not a directory: {path}"
 
         return True, ""
 
+    @staticmethod
+    def validate_many(
+        paths: Iterable[Union[str, Path]], directories: bool = False, must_exist: bool = True
+    ) -> list[tuple[bool, str]]:
+        """
+        Validate several paths, scanning each shared parent directory once
+
+        Each path is checked like validate_directory() (directories=True) or
+        validate_executable(). Siblings are answered from one os.scandir() of their
+        parent, whose entries know their file type without a stat() per path.
+
+        Returns: (is_valid, error_message) per path, in input order
+        """
+        paths = list(paths)
+
+        def validate_one(path):
+            if directories:
+                return PathValidator.validate_directory(path, must_exist)
+            return PathValidator.validate_executable(path)
+
+        by_parent: dict[str, list[int]] = {}
+        for i, path in enumerate(paths):
+            by_parent.setdefault(os.path.dirname(os.fspath(path)), []).append(i)
+
+        results: list[tuple[bool, str]] = [(False, "")] * len(paths)
+        for parent, indices in by_parent.items():
+            entries = None
+            # A lone path is cheaper to stat than its whole directory is to scan
+            if len(indices) > 1:
+                try:
+                    with os.scandir(parent or ".") as it:
+                        entries = {entry.name: entry for entry in it}
+                except OSError:
+                    pass
+
+            for i in indices:
+                path = paths[i]
+                entry = entries.get(os.path.basename(os.fspath(path))) if entries else None
+                # Not listed (e.g. case differs on a case-insensitive filesystem, or
+                # "." / ".." / trailing separator) or a symlink: use a real stat()
+                if entry is None or entry.is_symlink():
+                    results[i] = validate_one(path)
+                elif directories:
+                    is_dir = entry.is_dir()
+                    results[i] = (True, "") if is_dir else (False, f"Not a directory: {path}")
+                elif not entry.is_file():
+                    results[i] = (False, f"Not a file: {path}")
+                elif not _IS_WINDOWS and not os.access(path, os.X_OK):
+                    results[i] = (False, f"Not executable: {path}")
+                else:
+                    results[i] = (True, "")
+
+        return results
+
     @staticmethod
     def suggest_fix(path: Union[str, Path], issue: str) -> str:
         """
@@ -219,21 +422,23 @@ class PathValidator:
 
         Returns: Suggested fix command or instruction
         """
-        if "not found" in issue.lower():
+        # Keywords are checked in priority order ("not found" wins over "spaces")
+        issue = issue.lower()
+
+        if "not found" in issue:
             parent = Path(path).parent
             if parent.exists():
                 return f"Create with: mkdir '{path}'"
             else:
                 return f"Create parent directories with: mkdir -p '{path}'"
 
-        if "spaces" in issue.lower():
-            shell = PathFormatter.get_shell_type()
-            if shell in ["bash", "sh", "zsh"]:
+        if "spaces" in issue:
+            if _SHELL_TYPE in ("bash", "sh", "zsh", "fish"):
                 return f"Quote the path: '{path}'"
-            elif shell in ["powershell", "cmd"]:
+            elif _SHELL_TYPE in ("powershell", "cmd"):
                 return f'Quote the path: "{path}"'
 
-        if "not executable" in issue.lower():
+        if "not executable" in issue:
             return f"Make executable: chmod +x '{path}'"
 
         return "No suggestion available"
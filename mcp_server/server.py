@@ -4,13 +4,22 @@ USPTO MPEP RAG MCP Server
 Provides intelligent retrieval from the Manual of Patent Examining Procedure
 """
 
+import copy
+import heapq
 import json
+import multiprocessing
+import os
+import re
+import shutil
 
 # CRITICAL: Disable user site-packages BEFORE importing third-party packages
 # This prevents conflicts with global user installations
 import site
 import sys
 import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
@@ -74,7 +83,8 @@ except ImportError:
 try:
     import faiss
     import numpy as np
-    from sentence_transformers import CrossEncoder, SentenceTransformer
+    import sentence_transformers  # noqa: F401
+    import torch
 except ImportError:
     print(
         "Error: Required packages not found. Install with: pip install sentence-transformers faiss-cpu numpy torch",
@@ -82,15 +92,71 @@ except ImportError:
     )
     sys.exit(1)
 
-# BM25 for hybrid search
+# MPEP PDF extraction (module-level functions that spawned extraction workers can import)
 try:
-    from rank_bm25 import BM25Okapi
+    from .mpep_extract import chunk_text_with_metadata, extract_mpep_pdf, section_from_filename
 except ImportError:
-    print(
-        "Warning: rank-bm25 not found. Hybrid search disabled. Install with: pip install rank-bm25",
-        file=sys.stderr,
+    from mpep_extract import chunk_text_with_metadata, extract_mpep_pdf, section_from_filename
+
+# Array-backed BM25 for hybrid search
+try:
+    from .bm25_index import TOKENIZER, BM25Index, tokenize
+except ImportError:
+    from bm25_index import TOKENIZER, BM25Index, tokenize
+
+# Memory-mapped chunk texts and compact per-chunk metadata
+try:
+    from .chunk_store import ChunkStore, PageMetadata
+except ImportError:
+    from chunk_store import ChunkStore, PageMetadata
+
+# JSON helpers (orjson when available)
+try:
+    from .utils.json_io import load_json
+except ImportError:
+    from utils.json_io import load_json
+
+# Persistent cache of query embeddings and HyDE expansions
+try:
+    from .utils.query_cache import QueryCache
+except ImportError:
+    from utils.query_cache import QueryCache
+
+# Embedding/reranker loading (ONNX Runtime, FP16 and torch.compile options)
+try:
+    from .utils.models import load_embedding_model, load_reranker, model_variant
+except ImportError:
+    from utils.models import load_embedding_model, load_reranker, model_variant
+
+# USPTO Open Data Portal client
+try:
+    from .uspto_api import USPTOClient
+except ImportError:
+    from uspto_api import USPTOClient
+
+# FAISS index construction helpers
+try:
+    from .utils.faiss_utils import (
+        create_index,
+        index_to_cpu,
+        index_to_gpu,
+        read_index_mmap,
+        search_filtered,
+        set_ef_search,
+        set_nprobe,
+        train_on_sample,
+    )
+except ImportError:
+    from utils.faiss_utils import (
+        create_index,
+        index_to_cpu,
+        index_to_gpu,
+        read_index_mmap,
+        search_filtered,
+        set_ef_search,
+        set_nprobe,
+        train_on_sample,
     )
-    BM25Okapi = None
 
 
 # Initialize MCP server
@@ -125,6 +191,22 @@ CFR_37_FILE = "consolidated_rules.pdf"
 SUBSEQUENT_PUBS_URL = "https://www.uspto.gov/web/offices/pac/mpep/subsequent-publications.pdf"
 SUBSEQUENT_PUBS_FILE = "subsequent_publications.pdf"
 
+# 35 USC section headers: "§ 100", "§ 101", etc.
+_USC_SECTION = re.compile(r"§\s*(\d+)\.?\s+([^\n]{1,80})")
+
+# 37 CFR part headers ("PART 1") and rule sections ("§ 1.1", "§ 1.16")
+_CFR_PART = re.compile(r"PART\s+(\d+)")
+_CFR_RULE = re.compile(r"§\s*(\d+\.\d+)\s+([^\n]{1,80})")
+
+# Subsequent Publications: document type, Federal Register citation ("90 FR 3036"),
+# effective date and affected MPEP sections
+_FINAL_RULE = re.compile(r"Final\s+[Rr]ule")
+_MEMORANDUM = re.compile(r"Memorandum", re.IGNORECASE)
+_OG_NOTICE = re.compile(r"Official\s+Gazette", re.IGNORECASE)
+_FR_CITATION = re.compile(r"(\d+)\s+FR\s+(\d+)")
+_EFFECTIVE_DATE = re.compile(r"effective\s+(\w+\s+\d+,\s+\d{4})", re.IGNORECASE)
+_MPEP_SECTION_NUM = re.compile(r"MPEP\s*§?\s*(\d+(?:\.\d+)?)")
+
 
 def download_mpep_pdfs(url: str = MPEP_DOWNLOAD_URL, dest_dir: Path = MPEP_DIR) -> bool:
     """Download MPEP PDFs from USPTO website"""
@@ -144,6 +226,10 @@ def download_mpep_pdfs(url: str = MPEP_DOWNLOAD_URL, dest_dir: Path = MPEP_DIR)
     )
 
 
+# Copy buffer for streaming PDFs out of the MPEP zip
+EXTRACT_BUFFER_SIZE = 1 << 20
+
+
 def extract_mpep_pdfs(dest_dir: Path = MPEP_DIR) -> bool:
     """Extract MPEP PDFs from downloaded zip file"""
     zip_path = dest_dir / "mpep-pdfs.zip"
@@ -155,15 +241,27 @@ def extract_mpep_pdfs(dest_dir: Path = MPEP_DIR) -> bool:
     print(f"\nExtracting MPEP PDFs to {dest_dir.absolute()}", file=sys.stderr)
 
     try:
+        root = dest_dir.resolve()
         with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            pdf_files = [f for f in zip_ref.namelist() if f.endswith(".pdf")]
+            pdf_files = [info for info in zip_ref.infolist() if info.filename.endswith(".pdf")]
             total = len(pdf_files)
+            extracted = 0
+
+            for i, info in enumerate(pdf_files, 1):
+                target = (root / info.filename).resolve()
+                if not target.is_relative_to(root):
+                    print(f"\n✗ Skipping unsafe path in zip: {info.filename}", file=sys.stderr)
+                    continue
+                extracted += 1
 
-            for i, file in enumerate(pdf_files, 1):
-                zip_ref.extract(file, dest_dir)
+                # Re-runs skip PDFs that were already fully extracted
+                if not (target.exists() and target.stat().st_size == info.file_size):
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    with zip_ref.open(info) as src, target.open("wb") as dst:
+                        shutil.copyfileobj(src, dst, EXTRACT_BUFFER_SIZE)
                 print(f"\rExtracting: {i}/{total} files", end="", file=sys.stderr)
 
-            print(f"\n✓ Extracted {total} PDF files", file=sys.stderr)
+            print(f"\n✓ Extracted {extracted} PDF files", file=sys.stderr)
 
         print("✓ Cleaning up zip file", file=sys.stderr)
         zip_path.unlink()
@@ -232,15 +330,35 @@ def check_all_sources(dest_dir: Path = MPEP_DIR) -> dict[str, bool]:
 class MPEPIndex:
     """Manages indexing and retrieval of MPEP documents with advanced RAG techniques"""
 
+    # Embeddings are L2-normalized, so inner product ranks by cosine similarity.
+    # Small corpora use an exhaustive scan over 8-bit scalar-quantized vectors (a
+    # quarter of the FP32 memory, SIMD int8 distance kernels). From HNSW_MIN_VECTORS
+    # on, an HNSW graph (no training pass, ~99% recall at efSearch 64) replaces the
+    # scan, and from IVF_MIN_VECTORS on, where the graph's full vectors and links get
+    # large, an IVF-PQ index (~4 * sqrt(N) lists, 16-byte codes) probes IVF_NPROBE lists
+    FLAT_INDEX_KEY = "SQ8"
+    HNSW_MIN_VECTORS = 5_000
+    HNSW_M = 32
+    HNSW_EF_CONSTRUCTION = 200
+    HNSW_EF_SEARCH = 64
+    IVF_MIN_VECTORS = 500_000
+    IVF_PQ_M = 16
+    IVF_NPROBE = 16
+
+    EMBEDDING_MODEL = "BAAI/bge-base-en-v1.5"
+    QUERY_CACHE_SIZE = 1024
+    RERANK_CACHE_SIZE = 10_000  # (query, chunk id) -> cross-encoder score
+    RESULT_CACHE_SIZE = 256  # Full search results per (query, top_k, retrieve_k, filters)
+
     def __init__(self, use_hyde: bool = True):
         # Detect and use GPU if available
         self.device = get_device()
 
         print("Loading embedding model (BGE-base)...", file=sys.stderr)
-        self.model = SentenceTransformer("BAAI/bge-base-en-v1.5", device=self.device)
+        self.model = load_embedding_model(self.EMBEDDING_MODEL, self.device)
 
         print("Loading reranker model...", file=sys.stderr)
-        self.reranker = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2", device=self.device)
+        self.reranker = load_reranker("cross-encoder/ms-marco-MiniLM-L-6-v2", self.device)
 
         # Initialize HyDE query expander
         self.use_hyde = use_hyde
@@ -258,129 +376,60 @@ class MPEPIndex:
                 self.use_hyde = False
 
         self.chunks = []
-        self.metadata = []
+        self.metadata = PageMetadata.from_records([])
         self.index = None
         self.bm25 = None
+        self._gpu_resources = None  # Keeps FAISS GPU memory alive while the index is on GPU
         self.index_file = INDEX_DIR / "mpep_index.faiss"
         self.metadata_file = INDEX_DIR / "mpep_metadata.json"
-        self.bm25_file = INDEX_DIR / "mpep_bm25.json"
-
-    def extract_text_from_pdf(self, pdf_path: Path) -> list[dict[str, Any]]:
-        """Extract text from PDF with contextual metadata"""
-        chunks = []
-        doc = None
-        try:
-            doc = fitz.open(pdf_path)
-            section = self._extract_section_from_filename(pdf_path.name)
-
-            for page_num, page in enumerate(doc):  # type: ignore[arg-type]
-                text = page.get_text()
-                if text.strip():
-                    # Use common chunking helper
-                    page_chunks = self._chunk_text_with_metadata(
-                        text=text,
-                        section_label=section,
-                        base_metadata={
-                            "source": "MPEP",
-                            "file": pdf_path.name,
-                            "page": page_num + 1,
-                            "section": section,
-                            "is_statute": False,
-                            "is_regulation": False,
-                            "is_update": False,
-                        },
-                    )
-                    chunks.extend(page_chunks)
-        except Exception as e:
-            print(f"Error processing {pdf_path}: {e}", file=sys.stderr)
-        finally:
-            if doc is not None:
-                doc.close()
-        return chunks
-
-    def _extract_section_from_filename(self, filename: str) -> str:
-        """Extract MPEP section number from filename"""
-        # mpep-0100.pdf -> MPEP 100
-        # mpep-2100.pdf -> MPEP 2100
-        parts = filename.replace(".pdf", "").split("-")
-        if len(parts) > 1:
-            section = parts[1]
-            if section.startswith("0") and len(section) == 4:
-                section = section.lstrip("0") or "0"
-            return f"MPEP {section}"
-        return filename
-
-    def _chunk_text_with_metadata(
-        self,
-        text: str,
-        section_label: str,
-        base_metadata: dict[str, Any],
-        chunk_size: int = 500,
-        overlap: int = 100,
-        min_chunk_length: int = 50,
-    ) -> list[dict[str, Any]]:
-        """
-        Common helper to chunk text and attach metadata with cross-reference detection.
-
-        Args:
-            text: Raw text to chunk
-            section_label: Label to prepend (e.g., "MPEP 100", "35 U.S.C. §101")
-            base_metadata: Base metadata dict to include in all chunks
-            chunk_size: Characters per chunk
-            overlap: Overlapping characters between chunks
-            min_chunk_length: Minimum chunk length to keep
-
-        Returns:
-            List of chunk dictionaries with text and metadata
-        """
-        import re
-
-        chunks = []
-        for i in range(0, len(text), chunk_size - overlap):
-            chunk_text = text[i : i + chunk_size]
-            if len(chunk_text.strip()) < min_chunk_length:
-                continue
-
-            # Prepend section context to chunk
-            contextualized_text = f"[{section_label}] {chunk_text}"
-
-            # Detect cross-references in chunk
-            has_mpep_ref = bool(re.search(r"MPEP\s*§?\s*\d+", chunk_text))
-            has_usc_ref = bool(re.search(r"35 U\.?S\.?C\.?\s*§?\s*\d+", chunk_text))
-            has_cfr_ref = bool(re.search(r"37 C\.?F\.?R\.?\s*§?\s*\d+", chunk_text))
-
-            # Merge base metadata with detected references
-            chunk_metadata = {
-                "text": contextualized_text,
-                **base_metadata,
-                "has_mpep_ref": has_mpep_ref,
-                "has_usc_ref": has_usc_ref,
-                "has_cfr_ref": has_cfr_ref,
-                "has_statute": base_metadata.get("has_statute", False) or has_usc_ref,
-                "has_rule_ref": base_metadata.get("has_rule_ref", False) or has_cfr_ref,
-            }
-
-            chunks.append(chunk_metadata)
-
-        return chunks
+        self.chunks_file = INDEX_DIR / "mpep_chunks.bin"
+        self.chunk_offsets_file = INDEX_DIR / "mpep_chunk_offsets.npy"
+        self.chunk_blocks_file = INDEX_DIR / "mpep_chunk_blocks.npy"
+        self.chunk_meta_file = INDEX_DIR / "mpep_chunk_meta.npz"
+        self.bm25_file = INDEX_DIR / "mpep_bm25.npz"
+
+        # Repeated queries skip encoding and HyDE (in memory, and across sessions on disk)
+        self._query_cache = QueryCache(INDEX_DIR / "mpep_query_cache.sqlite")
+        # Embedding cache keys name the backend/precision the vectors came from
+        self._embedding_key = f"embedding:{self.EMBEDDING_MODEL}:{model_variant(self.model)}"
+        self._encode_queries = lru_cache(maxsize=self.QUERY_CACHE_SIZE)(
+            self._encode_queries_uncached
+        )
+        self._expand_query = lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._expand_query_uncached)
+        # Index-dependent caches, cleared whenever the index is (re)built or loaded
+        self._filter_mask = lru_cache(maxsize=64)(self._filter_mask_uncached)
+        self._bm25_hits = lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._bm25_hits_uncached)
+        self._rerank_cache: OrderedDict[tuple[str, int], float] = OrderedDict()
+        self._search = lru_cache(maxsize=self.RESULT_CACHE_SIZE)(self._search_uncached)
+        self._guidance_refs = lru_cache(maxsize=None)(self._guidance_refs_uncached)
+        # BM25 scoring overlaps with HyDE, query encoding and the FAISS search
+        self._bm25_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mpep-bm25")
+
+    @staticmethod
+    def extract_text_from_pdf(pdf_path: Path) -> list[dict[str, Any]]:
+        """Extract text from an MPEP chapter PDF with contextual metadata"""
+        return extract_mpep_pdf(pdf_path)
+
+    _extract_section_from_filename = staticmethod(section_from_filename)
+    _chunk_text_with_metadata = staticmethod(chunk_text_with_metadata)
 
     def extract_text_from_usc(self, pdf_path: Path) -> list[dict[str, Any]]:
         """Extract text from 35 USC PDF with statute section detection"""
-        import re
-
         chunks = []
         doc = None
         try:
             doc = fitz.open(pdf_path)
             current_section = "35 U.S.C."
 
-            for page_num, page in enumerate(doc):  # type: ignore[arg-type]
-                text = page.get_text()
+            # Load pages by number and keep no reference, so each page is freed
+            # before the next one is parsed
+            for page_num in range(doc.page_count):
+                text = doc.load_page(page_num).get_text("text", sort=False)
                 if not text.strip():
                     continue
 
                 # Detect section headers: "§ 100", "§ 101", etc.
-                section_matches = list(re.finditer(r"§\s*(\d+)\.?\s+([^\n]{1,80})", text))
+                section_matches = list(_USC_SECTION.finditer(text))
 
                 # If we found sections on this page, process them
                 if section_matches:
@@ -414,8 +463,6 @@ class MPEPIndex:
 
     def extract_text_from_cfr(self, pdf_path: Path) -> list[dict[str, Any]]:
         """Extract text from 37 CFR PDF with rule section detection"""
-        import re
-
         chunks = []
         doc = None
         try:
@@ -423,18 +470,20 @@ class MPEPIndex:
             current_rule = "37 C.F.R."
             current_part = "Part 1"
 
-            for page_num, page in enumerate(doc):  # type: ignore[arg-type]
-                text = page.get_text()
+            # Load pages by number and keep no reference, so each page is freed
+            # before the next one is parsed
+            for page_num in range(doc.page_count):
+                text = doc.load_page(page_num).get_text("text", sort=False)
                 if not text.strip():
                     continue
 
                 # Detect part headers: "PART 1", "PART 5", etc.
-                part_match = re.search(r"PART\s+(\d+)", text)
+                part_match = _CFR_PART.search(text)
                 if part_match:
                     current_part = f"Part {part_match.group(1)}"
 
                 # Detect rule sections: "§ 1.1", "§ 1.16", etc.
-                rule_matches = list(re.finditer(r"§\s*(\d+\.\d+)\s+([^\n]{1,80})", text))
+                rule_matches = list(_CFR_RULE.finditer(text))
 
                 if rule_matches:
                     for match in rule_matches:
@@ -468,8 +517,6 @@ class MPEPIndex:
 
     def extract_text_from_subsequent_pubs(self, pdf_path: Path) -> list[dict[str, Any]]:
         """Extract text from Subsequent Publications PDF with update tracking"""
-        import re
-
         chunks = []
         doc = None
         try:
@@ -479,32 +526,34 @@ class MPEPIndex:
             fr_citation = None
             effective_date = None
 
-            for page_num, page in enumerate(doc):  # type: ignore[arg-type]
-                text = page.get_text()
+            # Load pages by number and keep no reference, so each page is freed
+            # before the next one is parsed
+            for page_num in range(doc.page_count):
+                text = doc.load_page(page_num).get_text("text", sort=False)
                 if not text.strip():
                     continue
 
                 # Detect document type
-                if re.search(r"Final\s+[Rr]ule", text):
+                if _FINAL_RULE.search(text):
                     current_doc_type = "Final Rule"
-                elif re.search(r"Memorandum", text, re.IGNORECASE):
+                elif _MEMORANDUM.search(text):
                     current_doc_type = "Memorandum"
-                elif re.search(r"Official\s+Gazette", text, re.IGNORECASE):
+                elif _OG_NOTICE.search(text):
                     current_doc_type = "OG Notice"
 
                 # Extract Federal Register citation: "90 FR 3036"
-                fr_match = re.search(r"(\d+)\s+FR\s+(\d+)", text)
+                fr_match = _FR_CITATION.search(text)
                 if fr_match:
                     fr_citation = f"{fr_match.group(1)} FR {fr_match.group(2)}"
                     current_doc_title = f"{current_doc_type} {fr_citation}"
 
                 # Extract effective date
-                date_match = re.search(r"effective\s+(\w+\s+\d+,\s+\d{4})", text, re.IGNORECASE)
+                date_match = _EFFECTIVE_DATE.search(text)
                 if date_match:
                     effective_date = date_match.group(1)
 
-                # Detect affected MPEP sections
-                mpep_sections_affected = list(set(re.findall(r"MPEP\s*§?\s*(\d+(?:\.\d+)?)", text)))
+                # Detect affected MPEP sections (one immutable tuple shared by the page's chunks)
+                mpep_sections_affected = tuple(sorted(set(_MPEP_SECTION_NUM.findall(text))))
 
                 # Chunk the text using common helper
                 page_chunks = self._chunk_text_with_metadata(
@@ -585,42 +634,113 @@ class MPEPIndex:
             )
             print(f"To manually delete PDFs later: rm {MPEP_DIR}/*.pdf", file=sys.stderr)
 
+    @staticmethod
+    def _extract_pdfs(extract, pdf_files: list[Path]) -> list[list[dict[str, Any]]]:
+        """Run extract(pdf_file) for every file, in parallel across CPU cores
+
+        Each PDF is independent, so files are spread over one worker process per
+        core (results keep the input order). extract must be a picklable module-level
+        function (e.g. mpep_extract.extract_mpep_pdf). Workers are spawned, not
+        forked: by now the models, CUDA and torch's thread pools are initialized, and
+        forking such a process can deadlock. A spawned worker is a fresh interpreter
+        that re-imports the main module and extract's module (PyMuPDF included), so
+        the pool only pays off for several PDFs; a single PDF, or a platform where
+        worker processes cannot be started, is extracted in this process.
+        """
+        workers = min(len(pdf_files), os.cpu_count() or 1)
+        # One PDF (or one core): extracting inline beats starting a worker
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                ) as executor:
+                    return list(executor.map(extract, pdf_files))
+            except (OSError, RuntimeError) as e:
+                # e.g. no semaphore support in sandboxes, or a worker crashed
+                print(
+                    f"Parallel PDF extraction unavailable ({e}), continuing serially",
+                    file=sys.stderr,
+                )
+
+        return [extract(pdf_file) for pdf_file in pdf_files]
+
+    def _create_faiss_index(self, num_vectors: int, dimension: int):
+        """Create an empty FAISS index sized for the corpus"""
+        if num_vectors >= self.IVF_MIN_VECTORS:
+            nlist = int(4 * num_vectors**0.5)
+            index_key = f"IVF{nlist},PQ{self.IVF_PQ_M}"
+            print(f"Using {index_key} index for {num_vectors:,} vectors", file=sys.stderr)
+            return create_index(dimension, index_key)
+
+        if num_vectors >= self.HNSW_MIN_VECTORS:
+            print(f"Using HNSW{self.HNSW_M} index for {num_vectors:,} vectors", file=sys.stderr)
+            index = create_index(dimension, f"HNSW{self.HNSW_M}")
+            faiss.downcast_index(index).hnsw.efConstruction = self.HNSW_EF_CONSTRUCTION
+            return index
+
+        return create_index(dimension, self.FLAT_INDEX_KEY)
+
+    def _build_bm25(self):
+        """Build the BM25 keyword index over the loaded chunks"""
+        self.bm25 = BM25Index.from_corpus(tokenize(chunk) for chunk in self.chunks)
+
+    def _migrate_metadata_json(self):
+        """Convert an index saved as one {"chunks", "metadata"} JSON to the split layout"""
+        print("Converting MPEP metadata to the compact layout...", file=sys.stderr)
+        data = load_json(self.metadata_file)
+        ChunkStore.write(
+            data.pop("chunks"), self.chunks_file, self.chunk_offsets_file, self.chunk_blocks_file
+        )
+        PageMetadata.from_records(data.pop("metadata")).save(
+            self.metadata_file, self.chunk_meta_file
+        )
+
+    def _close_chunks(self):
+        """Unmap the loaded chunk store so its files can be reopened or rewritten"""
+        if isinstance(self.chunks, ChunkStore):
+            self.chunks.close()
+        self.chunks = []
+
     def build_index(self, force_rebuild: bool = False):
         """Build or load the FAISS index with BM25"""
+        self._close_chunks()
+        self._filter_mask.cache_clear()
+        self._bm25_hits.cache_clear()
+        self._rerank_cache.clear()
+        self._search.cache_clear()
+        self._guidance_refs.cache_clear()
         if not force_rebuild and self.index_file.exists() and self.metadata_file.exists():
             try:
                 # Load existing index
-                self.index = faiss.read_index(str(self.index_file))
-                with self.metadata_file.open(encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.chunks = data["chunks"]
-                    self.metadata = data["metadata"]
+                self.index = read_index_mmap(self.index_file)
+                set_nprobe(self.index, self.IVF_NPROBE)
+                set_ef_search(self.index, self.HNSW_EF_SEARCH)
+                self.index, self._gpu_resources = index_to_gpu(self.index, self.device)
+                if not self.chunk_meta_file.exists():
+                    self._migrate_metadata_json()
+                self.metadata = PageMetadata.load(self.metadata_file, self.chunk_meta_file)
+                self.chunks = ChunkStore(
+                    self.chunks_file, self.chunk_offsets_file, self.chunk_blocks_file
+                )
                 print(f"Loaded existing index with {len(self.chunks)} chunks", file=sys.stderr)
-            except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+            except (OSError, ValueError, KeyError) as e:
                 print(f"Failed to load index files, will rebuild: {e}", file=sys.stderr)
                 force_rebuild = True
 
-            # Load BM25 index from pickle if available
-            if not force_rebuild and BM25Okapi and self.bm25_file.exists():
+            # Load BM25 index (rebuilt once for indexes that only have the old
+            # rank-bm25 pickle or were tokenized differently)
+            if not force_rebuild:
                 try:
-                    import pickle
-
-                    print("Loading BM25 index from disk...", file=sys.stderr)
-                    # Note: pickle is only used for locally-generated index files (trusted source)
-                    with self.bm25_file.open("rb") as f:
-                        self.bm25 = pickle.load(f)  # nosec B301 - loading trusted local index
+                    if self.bm25_file.exists():
+                        print("Loading BM25 index from disk...", file=sys.stderr)
+                        self.bm25 = BM25Index.load(self.bm25_file)
+                    if self.bm25 is None or self.bm25.tokenizer != TOKENIZER:
+                        print("Rebuilding BM25 index from chunks...", file=sys.stderr)
+                        self._build_bm25()
+                        self.bm25.save(self.bm25_file)
                     print("Hybrid search enabled", file=sys.stderr)
                 except Exception as e:
-                    print(
-                        f"Failed to load BM25 index: {e}, rebuilding...",
-                        file=sys.stderr,
-                    )
-                    tokenized = [chunk.lower().split() for chunk in self.chunks]
-                    self.bm25 = BM25Okapi(tokenized)
-            elif not force_rebuild and BM25Okapi and self.chunks:
-                print("BM25 index file missing, rebuilding from chunks...", file=sys.stderr)
-                tokenized = [chunk.lower().split() for chunk in self.chunks]
-                self.bm25 = BM25Okapi(tokenized)
+                    print(f"Failed to load BM25 index: {e}", file=sys.stderr)
             return
 
         # Build new index from all available sources
@@ -631,9 +751,10 @@ class MPEPIndex:
         mpep_files = sorted(MPEP_DIR.glob("mpep-*.pdf"))
         if mpep_files:
             print(f"Processing {len(mpep_files)} MPEP PDFs...", file=sys.stderr)
-            for pdf_file in mpep_files:
-                print(f"  {pdf_file.name}...", file=sys.stderr)
-                chunks = self.extract_text_from_pdf(pdf_file)
+            for pdf_file, chunks in zip(
+                mpep_files, self._extract_pdfs(extract_mpep_pdf, mpep_files)
+            ):
+                print(f"  {pdf_file.name}: {len(chunks)} chunks", file=sys.stderr)
                 all_chunks.extend(chunks)
             print(
                 f"  ✓ Extracted {len([c for c in all_chunks if c.get('source') != '35_USC' and c.get('source') != '37_CFR' and c.get('source') != 'SUBSEQUENT'])} MPEP chunks",
@@ -691,6 +812,21 @@ class MPEPIndex:
         )
         texts = [chunk["text"] for chunk in all_chunks]
 
+        # Headers, footers and boilerplate recur verbatim across pages: encode each
+        # distinct chunk once and map every chunk to its row (first occurrence order)
+        unique_rows: dict[str, int] = {}
+        rows = np.fromiter(
+            (unique_rows.setdefault(text, len(unique_rows)) for text in texts),
+            dtype=np.int64,
+            count=len(texts),
+        )
+        unique_texts = list(unique_rows)
+        if len(unique_texts) < len(texts):
+            print(
+                f"Skipping {len(texts) - len(unique_texts):,} duplicate chunks when encoding",
+                file=sys.stderr,
+            )
+
         # Optimize batch size for GPU/CPU
         if self.device == "cuda":
             batch_size = 256  # Large batch for GPU
@@ -699,19 +835,31 @@ class MPEPIndex:
             batch_size = 32  # Smaller batch for CPU
             print(f"Using CPU batch size: {batch_size}", file=sys.stderr)
 
-        embeddings = self.model.encode(
-            texts, batch_size=batch_size, show_progress_bar=True, device=self.device
-        )
+        # Normalized by the encoder (per batch, on the model's device) for cosine similarity
+        with torch.inference_mode():
+            embeddings = self.model.encode(
+                unique_texts,
+                batch_size=batch_size,
+                show_progress_bar=True,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                device=self.device,
+            )
         print(f"✓ Generated {len(embeddings):,} embeddings", file=sys.stderr)
 
-        # Build FAISS index
-        dimension = embeddings.shape[1]
-        self.index = faiss.IndexFlatL2(dimension)
-        self.index.add(embeddings.astype("float32"))  # type: ignore[call-arg]
+        # Build FAISS index (FP16 models return float16; FAISS needs float32), one row
+        # per chunk so duplicates stay individually searchable
+        embeddings = np.asarray(embeddings, dtype=np.float32)[rows]
+        self.index = self._create_faiss_index(len(embeddings), embeddings.shape[1])
+        train_on_sample(self.index, embeddings)
+        self.index.add(embeddings)  # type: ignore[call-arg]
+        set_nprobe(self.index, self.IVF_NPROBE)
+        set_ef_search(self.index, self.HNSW_EF_SEARCH)
+        self.index, self._gpu_resources = index_to_gpu(self.index, self.device)
 
         self.chunks = texts
         # Preserve all metadata from all source types
-        self.metadata = []
+        records = []
         for c in all_chunks:
             meta = {
                 "source": c.get("source", "MPEP"),
@@ -733,27 +881,24 @@ class MPEPIndex:
                 meta["doc_type"] = c.get("doc_type")
                 meta["fr_citation"] = c.get("fr_citation")
                 meta["effective_date"] = c.get("effective_date")
-                meta["mpep_sections_affected"] = c.get("mpep_sections_affected", [])
+                meta["mpep_sections_affected"] = c.get("mpep_sections_affected", ())
                 meta["supersedes_mpep"] = c.get("supersedes_mpep", False)
 
-            self.metadata.append(meta)
+            records.append(meta)
+        self.metadata = PageMetadata.from_records(records)
 
         # Build BM25 index for hybrid search
-        if BM25Okapi:
-            import pickle
-
-            print("Building BM25 index for hybrid search...", file=sys.stderr)
-            tokenized = [chunk.lower().split() for chunk in texts]
-            self.bm25 = BM25Okapi(tokenized)
-            # Persist BM25 index to disk
-            with self.bm25_file.open("wb") as f:
-                pickle.dump(self.bm25, f)
-            print("Hybrid search enabled", file=sys.stderr)
-
-        # Save index
-        faiss.write_index(self.index, str(self.index_file))
-        with self.metadata_file.open("w", encoding="utf-8") as f:
-            json.dump({"chunks": self.chunks, "metadata": self.metadata}, f)
+        print("Building BM25 index for hybrid search...", file=sys.stderr)
+        self._build_bm25()
+        self.bm25.save(self.bm25_file)
+        print("Hybrid search enabled", file=sys.stderr)
+
+        # Save index (GPU indices are copied back to CPU for serialization)
+        faiss.write_index(index_to_cpu(self.index), str(self.index_file))
+        ChunkStore.write(
+            self.chunks, self.chunks_file, self.chunk_offsets_file, self.chunk_blocks_file
+        )
+        self.metadata.save(self.metadata_file, self.chunk_meta_file)
 
         print(f"Index built and saved with {len(self.chunks)} chunks", file=sys.stderr)
 
@@ -780,19 +925,59 @@ class MPEPIndex:
             is_statute: Filter for statute content (True/False/None)
             is_regulation: Filter for regulation content (True/False/None)
             is_update: Filter for recent updates (True/False/None)
+
+        Results are memoized per (query, top_k, retrieve_k, filters) until the index is rebuilt;
+        each call returns fresh copies.
         """
         if self.index is None:
             raise ValueError("Index not built. Call build_index() first.")
 
         retrieve_k = min(top_k * 4, 50) if retrieve_k is None else min(retrieve_k, 100)  # Cap at 100 for performance
-        candidates = {}
+
+        # Deep copies, so callers that edit a result do not corrupt the cached one
+        return copy.deepcopy(
+            list(
+                self._search(
+                    query.strip(),
+                    top_k,
+                    retrieve_k,
+                    source_filter,
+                    is_statute,
+                    is_regulation,
+                    is_update,
+                )
+            )
+        )
+
+    def _search_uncached(
+        self,
+        query: str,
+        top_k: int,
+        retrieve_k: int,
+        source_filter: Optional[str],
+        is_statute: Optional[bool],
+        is_regulation: Optional[bool],
+        is_update: Optional[bool],
+    ) -> list[dict[str, Any]]:
+        """Run the hybrid search (arguments already validated and capped by search)"""
+        # Metadata filters (vectorized over per-page columns) are pushed into both
+        # retrievers, so every retrieved slot holds a chunk that passes them
+        filters = (source_filter, is_statute, is_regulation, is_update)
+        allowed = self._filter_mask(*filters)
+
+        # Hybrid search: BM25 supplies the lexical signal of the original query; it is
+        # scored in the background while the vector side runs on this thread
+        bm25_future = (
+            self._bm25_executor.submit(self._bm25_hits, query, retrieve_k, filters)
+            if self.bm25
+            else None
+        )
 
         # HyDE Query Expansion (if enabled)
         queries_to_search = [query]
         if self.use_hyde and self.hyde_expander:
             try:
-                expanded_queries = self.hyde_expander.expand_query(query, num_expansions=3)
-                queries_to_search = expanded_queries
+                queries_to_search = list(self._expand_query(query))
                 print(
                     f"HyDE: Expanded to {len(queries_to_search)} queries",
                     file=sys.stderr,
@@ -800,119 +985,184 @@ class MPEPIndex:
             except Exception as e:
                 print(f"HyDE expansion failed: {e}, using original query", file=sys.stderr)
 
-        # Search with each query variant (original + hypothetical docs)
-        for query_idx, search_query in enumerate(queries_to_search):
-            query_weight = 1.0 if query_idx == 0 else 0.5  # Weight original query higher
+        # Vector search for all query variants at once: one encoder forward pass and
+        # one FAISS call over the batch of query vectors
+        query_embeddings = self._encode_queries(tuple(queries_to_search))
+        if allowed is None:
+            _, all_indices = self.index.search(query_embeddings, retrieve_k)
+        else:
+            _, all_indices = search_filtered(
+                self.index,
+                query_embeddings,
+                retrieve_k,
+                allowed,
+                nprobe=self.IVF_NPROBE,
+                ef_search=self.HNSW_EF_SEARCH,
+            )
+
+        # Collect (chunk id, RRF contribution) pairs from the vector search of every query
+        # variant (original + hypothetical docs) in one array op, so the single-query
+        # path has no per-variant loop; ranks are 1-based, and invalid -1 FAISS slots
+        # still consume a rank
+        rank_weights = 1.0 / (60 + np.arange(1, retrieve_k + 1))
+        query_weights = np.full((len(all_indices), 1), 0.5)
+        query_weights[0] = 1.0  # Weight original query higher
+        hit_ids = [all_indices.ravel()]
+        hit_weights = [(query_weights * rank_weights).ravel()]
+
+        # Add BM25 results if available (the hypothetical documents only feed the vector search)
+        if bm25_future is not None:
+            bm25_top_indices = bm25_future.result()
+            hit_ids.append(bm25_top_indices)
+            hit_weights.append(rank_weights[: len(bm25_top_indices)])
+
+        # Reciprocal Rank Fusion: sum the contributions per chunk over the candidates only
+        ids = np.concatenate(hit_ids).astype(np.int64)
+        weights = np.concatenate(hit_weights)
+        valid = (ids >= 0) & (ids < len(self.chunks))
+        ids, weights = ids[valid], weights[valid]
+        if allowed is not None:
+            # Only hits from an index that could not apply the selector can fail the filter
+            keep = allowed[ids]
+            ids, weights = ids[keep], weights[keep]
+        cand_ids, inverse = np.unique(ids, return_inverse=True)
+        rrf_scores = np.bincount(inverse, weights=weights, minlength=len(cand_ids))
+
+        # Take top candidates by RRF for reranking; only their texts are materialized
+        top = np.argsort(-rrf_scores, kind="stable")[:retrieve_k]
+        top_ids = cand_ids[top]
+        top_rrf = rrf_scores[top]
+
+        if not len(top_ids):
+            return []
+
+        # Rerank with cross-encoder using ORIGINAL query only
+        rerank_scores = self._rerank_scores(query, top_ids)
+
+        # Select the top_k by reranker score (ties keep RRF order); only these are materialized
+        best = heapq.nlargest(top_k, range(len(top_ids)), key=rerank_scores.__getitem__)
+        return [
+            {
+                "text": self.chunks[top_ids[i]],
+                "metadata": self.metadata[top_ids[i]],
+                "relevance_score": float(rerank_scores[i]),
+                "hybrid_rrf_score": float(top_rrf[i]),
+            }
+            for i in best
+        ]
+
+    def guidance_refs(self, query: str, top_k: int = 5) -> list[dict[str, Any]]:
+        """Short MPEP references for a fixed guidance query (computed once per index build)
+
+        Returns copies, so callers may edit them without touching the cached references.
+        """
+        return [dict(ref) for ref in self._guidance_refs(query, top_k)]
+
+    def _guidance_refs_uncached(self, query: str, top_k: int) -> tuple[dict[str, Any], ...]:
+        """Build the references returned by guidance_refs"""
+        return tuple(
+            {
+                "section": r["metadata"]["section"],
+                "page": r["metadata"]["page"],
+                "text": r["text"][:500] + "..." if len(r["text"]) > 500 else r["text"],
+            }
+            for r in self.search(query, top_k=top_k)
+        )
 
-            # Vector search with BGE query prefix (recommended format)
-            query_with_prefix = f"query: {search_query}"
-            query_embedding = self.model.encode([query_with_prefix])
-            vec_distances, vec_indices = self.index.search(
-                query_embedding.astype("float32"), retrieve_k
+    def _rerank_scores(self, query: str, chunk_ids: np.ndarray) -> np.ndarray:
+        """Cross-encoder scores for (query, chunk) pairs; only uncached pairs reach the model"""
+        keys = [(query, int(idx)) for idx in chunk_ids]
+        scores = np.empty(len(keys), dtype=np.float32)
+        missing = []
+        for i, key in enumerate(keys):
+            score = self._rerank_cache.get(key)
+            if score is None:
+                missing.append(i)
+            else:
+                scores[i] = score
+                self._rerank_cache.move_to_end(key)
+
+        if missing:
+            # All uncached candidates in one forward pass (predict defaults to batches of 32)
+            predicted = self.reranker.predict(
+                [[query, self.chunks[chunk_ids[i]]] for i in missing],
+                batch_size=len(missing),
+                show_progress_bar=False,
+                convert_to_numpy=True,
             )
+            for i, score in zip(missing, predicted):
+                scores[i] = score
+                self._rerank_cache[keys[i]] = float(score)
+            while len(self._rerank_cache) > self.RERANK_CACHE_SIZE:
+                self._rerank_cache.popitem(last=False)
 
-            # Add vector search results with RRF scoring
-            for rank, (idx, dist) in enumerate(zip(vec_indices[0], vec_distances[0])):
-                if idx < 0 or idx >= len(self.chunks):
-                    continue
-                rrf_contribution = query_weight * (1.0 / (60 + rank + 1))
-
-                if idx in candidates:
-                    candidates[idx]["rrf_score"] += rrf_contribution
-                    candidates[idx]["vector_score"] = max(
-                        candidates[idx].get("vector_score", 0), float(1 / (1 + dist))
-                    )
-                else:
-                    candidates[idx] = {
-                        "text": self.chunks[idx],
-                        "metadata": self.metadata[idx],
-                        "vector_score": float(1 / (1 + dist)),
-                        "rrf_score": rrf_contribution,
-                    }
-
-            # Hybrid search: add BM25 results if available
-            if self.bm25:
-                tokenized_query = search_query.lower().split()
-                bm25_scores = self.bm25.get_scores(tokenized_query)
-                bm25_top_indices = np.argsort(bm25_scores)[::-1][:retrieve_k]
-
-                for rank, idx in enumerate(bm25_top_indices):
-                    if idx < 0 or idx >= len(self.chunks):
-                        continue
-                    rrf_contribution = query_weight * (1.0 / (60 + rank + 1))
-
-                    if idx in candidates:
-                        candidates[idx]["rrf_score"] += rrf_contribution
-                        candidates[idx]["bm25_score"] = max(
-                            candidates[idx].get("bm25_score", 0),
-                            float(bm25_scores[idx]),
-                        )
-                    else:
-                        candidates[idx] = {
-                            "text": self.chunks[idx],
-                            "metadata": self.metadata[idx],
-                            "bm25_score": float(bm25_scores[idx]),
-                            "rrf_score": rrf_contribution,
-                        }
-
-        # Apply metadata filters if specified
-        if (
+        return scores
+
+    def _filter_mask_uncached(
+        self,
+        source_filter: Optional[str],
+        is_statute: Optional[bool],
+        is_regulation: Optional[bool],
+        is_update: Optional[bool],
+    ) -> Optional[np.ndarray]:
+        """Read-only mask of the chunks passing the filters (None when nothing is filtered)"""
+        if not (
             source_filter
             or is_statute is not None
             or is_regulation is not None
             or is_update is not None
         ):
-            filtered_candidates = {}
-            for idx, cand_data in candidates.items():
-                meta = cand_data["metadata"]
-
-                # Check source filter
-                if source_filter and meta.get("source", "MPEP") != source_filter:
-                    continue
-
-                # Check statute filter
-                if is_statute is not None and meta.get("is_statute", False) != is_statute:
-                    continue
-
-                # Check regulation filter
-                if is_regulation is not None and meta.get("is_regulation", False) != is_regulation:
-                    continue
-
-                # Check update filter
-                if is_update is not None and meta.get("is_update", False) != is_update:
-                    continue
-
-                filtered_candidates[idx] = cand_data
+            return None
+        allowed = self.metadata.filter_mask(
+            source=source_filter,
+            is_statute=is_statute,
+            is_regulation=is_regulation,
+            is_update=is_update,
+        )
+        allowed.flags.writeable = False
+        return allowed
 
-            candidates = filtered_candidates
+    def _bm25_hits_uncached(self, query: str, k: int, filters: tuple) -> np.ndarray:
+        """Read-only BM25 top-k chunk ids for a query among the chunks passing the filters"""
+        ids, _ = self.bm25.top_k(tokenize(query), k, self._filter_mask(*filters))
+        ids.flags.writeable = False
+        return ids
 
-        # Sort by RRF score and get top candidates for reranking
-        sorted_candidates = sorted(
-            candidates.items(), key=lambda x: x[1]["rrf_score"], reverse=True
-        )[:retrieve_k]
+    def _encode_queries_uncached(self, queries: tuple[str, ...]) -> np.ndarray:
+        """Normalized float32 embeddings, one row per query (read-only; shared through the caches)
 
-        if not sorted_candidates:
-            return []
+        Queries missing from the persistent cache are encoded together in one batch.
+        """
+        keys = [f"{self._embedding_key}:{query}" for query in queries]
+        cached = [self._query_cache.get(key) for key in keys]
+        missing = [i for i, value in enumerate(cached) if value is None]
+
+        if missing:
+            # BGE query prefix (recommended format)
+            encoded = self.model.encode(
+                [f"query: {queries[i]}" for i in missing],
+                batch_size=len(missing),
+                convert_to_numpy=True,
+            )
+            encoded = np.ascontiguousarray(encoded, dtype=np.float32)
+            faiss.normalize_L2(encoded)
+            for i, row in zip(missing, encoded):
+                cached[i] = row.tobytes()
+                self._query_cache.set(keys[i], cached[i])
 
-        # Rerank with cross-encoder using ORIGINAL query only
-        rerank_pairs = [[query, cand[1]["text"]] for cand in sorted_candidates]
-        rerank_scores = self.reranker.predict(rerank_pairs)
+        # frombuffer over bytes is read-only, so cached arrays cannot be modified in place
+        return np.frombuffer(b"".join(cached), dtype=np.float32).reshape(len(queries), -1)
 
-        # Combine rerank scores with candidates
-        final_results = []
-        for (_idx, cand), rerank_score in zip(sorted_candidates, rerank_scores):
-            final_results.append(
-                {
-                    "text": cand["text"],
-                    "metadata": cand["metadata"],
-                    "relevance_score": float(rerank_score),
-                    "hybrid_rrf_score": cand["rrf_score"],
-                }
-            )
+    def _expand_query_uncached(self, query: str) -> tuple[str, ...]:
+        """HyDE expansions of a query (API/local backends make a model call per query)"""
+        key = f"hyde:{self.hyde_expander.backend}:{query}"
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return tuple(json.loads(cached))
 
-        # Sort by reranker score and return top_k
-        final_results.sort(key=lambda x: x["relevance_score"], reverse=True)
-        return final_results[:top_k]
+        expansions = self.hyde_expander.expand_query(query, num_expansions=3)
+        self._query_cache.set(key, json.dumps(expansions).encode("utf-8"))
+        return tuple(expansions)
 
 
 # ============================================================================
@@ -984,20 +1234,19 @@ def get_mpep_section(section_number: str, max_chunks: int = 50) -> dict[str, Any
 
     # Find all chunks from the specified section
     section_pattern = f"MPEP {section_number}"
-    matching_chunks = [
-        {"text": chunk, "metadata": meta}
-        for chunk, meta in zip(mpep_index.chunks, mpep_index.metadata)
-        if section_pattern in meta["section"]
-    ]
+    matching = mpep_index.metadata.section_chunks(section_pattern)
 
-    if not matching_chunks:
+    if not len(matching):
         return {"error": f"No content found for MPEP section {section_number}"}
 
-    # Return requested number of chunks
+    # Return requested number of chunks (only those texts are read from the chunk store)
     return {
         "section": section_number,
-        "total_chunks": len(matching_chunks),
-        "chunks": matching_chunks[:max_chunks],
+        "total_chunks": len(matching),
+        "chunks": [
+            {"text": mpep_index.chunks[idx], "metadata": mpep_index.metadata[idx]}
+            for idx in matching[:max_chunks]
+        ],
     }
 
 
@@ -1010,20 +1259,8 @@ def review_patent_claims(claims_text: str) -> dict[str, Any]:
         analyzer = ClaimsAnalyzer()
         analysis_results = analyzer.analyze_claims(claims_text)
 
-        # Also get relevant MPEP guidance for context
-        mpep_results = mpep_index.search(
-            "claim definiteness antecedent basis 35 USC 112(b)", top_k=5
-        )
-
-        mpep_refs = []
-        for r in mpep_results:
-            mpep_refs.append(
-                {
-                    "section": r["metadata"]["section"],
-                    "page": r["metadata"]["page"],
-                    "text": r["text"][:500] + "..." if len(r["text"]) > 500 else r["text"],
-                }
-            )
+        # Also get relevant MPEP guidance for context (the same for every call)
+        mpep_refs = mpep_index.guidance_refs("claim definiteness antecedent basis 35 USC 112(b)")
 
         return {
             "analysis_type": "automated",
@@ -1077,18 +1314,8 @@ def review_specification(claims_text: str, specification: str) -> dict[str, Any]
         spec_analyzer = SpecificationAnalyzer()
         analysis_results = spec_analyzer.analyze_specification_support(parsed_claims, specification)
 
-        # Get relevant MPEP guidance
-        mpep_results = mpep_index.search("written description enablement 35 USC 112(a)", top_k=5)
-
-        mpep_refs = []
-        for r in mpep_results:
-            mpep_refs.append(
-                {
-                    "section": r["metadata"]["section"],
-                    "page": r["metadata"]["page"],
-                    "text": r["text"][:500] + "..." if len(r["text"]) > 500 else r["text"],
-                }
-            )
+        # Get relevant MPEP guidance (the same for every call)
+        mpep_refs = mpep_index.guidance_refs("written description enablement 35 USC 112(a)")
 
         return {
             "analysis_type": "automated",
@@ -1152,18 +1379,8 @@ def check_formalities(
             drawings_present=drawings_present,
         )
 
-        # Get relevant MPEP guidance
-        mpep_results = mpep_index.search("formalities abstract title drawings MPEP 608", top_k=5)
-
-        mpep_refs = []
-        for r in mpep_results:
-            mpep_refs.append(
-                {
-                    "section": r["metadata"]["section"],
-                    "page": r["metadata"]["page"],
-                    "text": r["text"][:500] + "..." if len(r["text"]) > 500 else r["text"],
-                }
-            )
+        # Get relevant MPEP guidance (the same for every call)
+        mpep_refs = mpep_index.guidance_refs("formalities abstract title drawings MPEP 608")
 
         return {
             "analysis_type": "automated",
@@ -1217,8 +1434,6 @@ def _ensure_uspto_client():
     """Lazy load USPTO API client"""
     global uspto_client
     if uspto_client is None:
-        from mcp_server.uspto_api import USPTOClient
-
         uspto_client = USPTOClient()
     return uspto_client
 
@@ -1256,27 +1471,22 @@ def search_uspto_api(
         )
 
         # Format results
-        from mcp_server.uspto_api import format_patent_result
-
-        formatted_results = []
-        for i, patent in enumerate(results, 1):
-            formatted_results.append(
-                {
-                    "rank": i,
-                    "patent_number": patent.patent_number,
-                    "application_number": patent.application_number,
-                    "title": patent.title,
-                    "filing_date": patent.filing_date,
-                    "grant_date": patent.grant_date,
-                    "type": patent.application_type,
-                    "status": patent.status,
-                    "inventors": patent.inventors,
-                    "applicants": patent.applicants,
-                    "formatted": format_patent_result(patent, verbose=False),
-                }
-            )
-
-        return formatted_results
+        return [
+            {
+                "rank": i,
+                "patent_number": patent.patent_number,
+                "application_number": patent.application_number,
+                "title": patent.title,
+                "filing_date": patent.filing_date,
+                "grant_date": patent.grant_date,
+                "type": patent.application_type,
+                "status": patent.status,
+                "inventors": patent.inventors,
+                "applicants": patent.applicants,
+                "formatted": patent.formatted_short,
+            }
+            for i, patent in enumerate(results, 1)
+        ]
 
     except Exception as e:
         return [{"error": f"USPTO API search failed: {str(e)}"}]
@@ -1303,8 +1513,6 @@ def get_uspto_patent(patent_number: str) -> dict[str, Any]:
         if not patent:
             return {"error": f"Patent {patent_number} not found in USPTO database"}
 
-        from mcp_server.uspto_api import format_patent_result
-
         return {
             "patent_number": patent.patent_number,
             "application_number": patent.application_number,
@@ -1315,7 +1523,7 @@ def get_uspto_patent(patent_number: str) -> dict[str, Any]:
             "status": patent.status,
             "inventors": patent.inventors,
             "applicants": patent.applicants,
-            "formatted": format_patent_result(patent, verbose=True),
+            "formatted": patent.formatted_verbose,
             "raw_metadata": patent.raw_data.get("applicationMetaData", {}),
         }
 
@@ -1345,23 +1553,18 @@ def get_recent_uspto_patents(
         )
 
         # Format results
-        from mcp_server.uspto_api import format_patent_result
-
-        formatted_results = []
-        for i, patent in enumerate(results, 1):
-            formatted_results.append(
-                {
-                    "rank": i,
-                    "patent_number": patent.patent_number,
-                    "title": patent.title,
-                    "grant_date": patent.grant_date,
-                    "filing_date": patent.filing_date,
-                    "inventors": patent.inventors,
-                    "formatted": format_patent_result(patent),
-                }
-            )
-
-        return formatted_results
+        return [
+            {
+                "rank": i,
+                "patent_number": patent.patent_number,
+                "title": patent.title,
+                "grant_date": patent.grant_date,
+                "filing_date": patent.filing_date,
+                "inventors": patent.inventors,
+                "formatted": patent.formatted_short,
+            }
+            for i, patent in enumerate(results, 1)
+        ]
 
     except Exception as e:
         return [{"error": f"Failed to retrieve recent patents: {str(e)}"}]
@@ -1508,10 +1711,14 @@ def check_patent_corpus_status() -> dict[str, Any]:
     try:
         from mcp_server.patent_corpus import check_patent_corpus_status as check_status
 
-        return check_status()
+        status = check_status()
     except ImportError:
         return {"error": "Patent corpus module not available"}
 
+    if patent_corpus_index is not None:
+        status["search_cache"] = patent_corpus_index.search_cache_info()
+    return status
+
 
 # Patent Diagram Generation Tools
 
@@ -1822,7 +2029,7 @@ def get_index_stats() -> str:
         "total_chunks": len(mpep_index.chunks),
         "total_metadata": len(mpep_index.metadata),
         "index_exists": mpep_index.index is not None,
-        "sections": len({m["section"] for m in mpep_index.metadata}),
+        "sections": len({page["section"] for page in mpep_index.metadata.pages}),
     }
     return json.dumps(stats, indent=2)
 
@@ -3,8 +3,10 @@
 
 import os
 import sys
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 from typing import Any, Optional
 
 import requests
@@ -28,6 +30,16 @@ class PatentSearchResult:
     abstract: Optional[str]
     raw_data: dict[str, Any]
 
+    @cached_property
+    def formatted_short(self) -> str:
+        """format_patent_result(self), computed once per result"""
+        return format_patent_result(self)
+
+    @cached_property
+    def formatted_verbose(self) -> str:
+        """format_patent_result(self, verbose=True), computed once per result"""
+        return format_patent_result(self, verbose=True)
+
 
 class USPTOAPIError(Exception):
     """Base exception for USPTO API errors"""
@@ -52,6 +64,7 @@ class USPTOClient:
 
     BASE_URL = "https://api.uspto.gov/api/v1/patent"
     DEFAULT_TIMEOUT = 30
+    PATENT_CACHE_SIZE = 256  # Patents looked up by number (repeat lookups skip the API)
 
     def __init__(self, api_key: Optional[str] = None):
         """Initialize USPTO API client
@@ -89,6 +102,10 @@ class USPTOClient:
                 }
             )
 
+        # Found patents by number, least recently used first; misses are not cached, so a
+        # patent that was not found (or a failed request) is looked up again next time
+        self._patent_cache: OrderedDict[str, PatentSearchResult] = OrderedDict()
+
     def _make_request(self, method: str, endpoint: str, **kwargs) -> dict[str, Any]:
         """Make HTTP request to USPTO API with error handling
 
@@ -348,7 +365,7 @@ class USPTOClient:
         return results
 
     def get_patent_by_number(self, patent_number: str) -> Optional[PatentSearchResult]:
-        """Retrieve a specific patent by patent number
+        """Retrieve a specific patent by patent number (found patents are cached)
 
         Args:
             patent_number: USPTO patent number (e.g., "11234567")
@@ -356,6 +373,11 @@ class USPTOClient:
         Returns:
             PatentSearchResult if found, None otherwise
         """
+        cached = self._patent_cache.get(patent_number)
+        if cached is not None:
+            self._patent_cache.move_to_end(patent_number)
+            return cached
+
         # Search for exact patent number
         response = self.search_patents(
             filters=[{"name": "applicationMetaData.patentNumber", "value": [patent_number]}],
@@ -363,9 +385,14 @@ class USPTOClient:
         )
 
         results = response.get("results", [])
-        if results:
-            return self._parse_patent_result(results[0])
-        return None
+        if not results:
+            return None
+
+        patent = self._parse_patent_result(results[0])
+        self._patent_cache[patent_number] = patent
+        if len(self._patent_cache) > self.PATENT_CACHE_SIZE:
+            self._patent_cache.popitem(last=False)
+        return patent
 
     def get_patent_by_application(self, application_number: str) -> Optional[PatentSearchResult]:
         """Retrieve a patent by application number
@@ -0,0 +1,33 @@
+"""Embedding helpers shared by the search indices"""
+
+from typing import Any
+
+import numpy as np
+
+
+def encode_sorted_by_length(
+    model: Any, texts: list[str], pool: Any, **encode_kwargs: Any
+) -> np.ndarray:
+    """Encode texts across a multi-process pool in length order, returning original order
+
+    ``encode_multi_process`` splits its input into contiguous shards, and each
+    worker's ``encode`` only length-sorts within its own shard. Sorting the whole
+    slice by length first gives every shard uniform batches with little padding;
+    the permutation is undone before returning. (Single-process ``model.encode``
+    already sorts by length and restores the order itself, so call it directly.)
+
+    Args:
+        model: SentenceTransformer-compatible model with ``encode_multi_process``
+        texts: Texts to encode
+        pool: Multi-process pool from ``model.start_multi_process_pool``
+        **encode_kwargs: Passed through to ``encode_multi_process``
+
+    Returns:
+        Embedding matrix with row i corresponding to texts[i]
+    """
+    order = np.argsort(np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts)))
+    embeddings = model.encode_multi_process([texts[i] for i in order], pool, **encode_kwargs)
+
+    restored = np.empty_like(embeddings)
+    restored[order] = embeddings
+    return restored
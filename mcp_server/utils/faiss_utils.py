@@ -0,0 +1,139 @@
+"""FAISS index construction helpers shared by the search indices"""
+
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+import faiss
+import numpy as np
+
+
+def create_index(
+    dimension: int, index_key: str, metric: int = faiss.METRIC_INNER_PRODUCT
+) -> faiss.Index:
+    """Create an empty FAISS index from a factory string (e.g. "IVF4096,PQ64")
+
+    Args:
+        dimension: Embedding dimension
+        index_key: FAISS index_factory description string
+        metric: FAISS metric (inner product by default, for normalized embeddings)
+
+    Returns:
+        Untrained FAISS index
+    """
+    return faiss.index_factory(dimension, index_key, metric)
+
+
+def train_on_sample(
+    index: faiss.Index, embeddings: np.ndarray, max_samples: int = 262_144, seed: int = 0
+) -> None:
+    """Train an index on a random sample of the embeddings (no-op if already trained)
+
+    IVF/PQ training cost grows with the number of training points, and a few
+    hundred thousand vectors is plenty to fit the coarse quantizer and codebooks.
+    """
+    if index.is_trained:
+        return
+
+    sample = embeddings
+    if len(embeddings) > max_samples:
+        rng = np.random.default_rng(seed)
+        sample = embeddings[np.sort(rng.choice(len(embeddings), max_samples, replace=False))]
+
+    print(f"Training FAISS index on {len(sample):,} vectors...", file=sys.stderr)
+    index.train(np.ascontiguousarray(sample, dtype=np.float32))
+
+
+def set_nprobe(index: faiss.Index, nprobe: int) -> None:
+    """Set the number of inverted lists probed per query (ignored for non-IVF indices)"""
+    try:
+        faiss.extract_index_ivf(index).nprobe = nprobe
+    except RuntimeError:
+        # GPU IVF indices expose nprobe directly; anything else is not IVF
+        if hasattr(index, "nprobe"):
+            index.nprobe = nprobe
+
+
+def set_ef_search(index: faiss.Index, ef_search: int) -> None:
+    """Set the HNSW search beam width (ignored for non-HNSW indices)"""
+    hnsw = getattr(faiss.downcast_index(index), "hnsw", None)
+    if hnsw is not None:
+        hnsw.efSearch = ef_search
+
+
+def search_filtered(
+    index: faiss.Index,
+    queries: np.ndarray,
+    k: int,
+    allowed: np.ndarray,
+    nprobe: int,
+    ef_search: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Search only the ids where allowed (a boolean mask over all ids) is True
+
+    The ids are passed to FAISS as a bitmap selector, so filtered-out vectors are
+    skipped during the scan instead of taking up result slots. Per-search parameters
+    replace the index's own, so nprobe/efSearch are passed along. Indexes that do not
+    accept a selector (e.g. some GPU indexes) get an unrestricted search, so callers
+    should still check the returned ids.
+    """
+    bits = np.packbits(allowed, bitorder="little")
+    selector = faiss.IDSelectorBitmap(len(allowed), faiss.swig_ptr(bits))
+    try:
+        if hasattr(faiss.downcast_index(index), "hnsw"):
+            params = faiss.SearchParametersHNSW(sel=selector, efSearch=ef_search)
+        else:
+            try:
+                faiss.extract_index_ivf(index)
+                params = faiss.SearchParametersIVF(sel=selector, nprobe=nprobe)
+            except RuntimeError:
+                params = faiss.SearchParameters(sel=selector)
+        return index.search(queries, k, params=params)
+    except Exception:
+        return index.search(queries, k)
+
+
+def index_to_gpu(index: faiss.Index, device: str) -> tuple[faiss.Index, Optional[Any]]:
+    """Copy an index to GPU 0 when running on CUDA with a GPU-enabled FAISS build
+
+    faiss-cpu (the default dependency, and the only option on Windows) has no GPU
+    support, and some index types have no GPU implementation; both fall back to CPU.
+
+    Returns:
+        (index, gpu_resources) - the resources object must stay referenced for as long
+        as the GPU index is used; it is None when the index stays on the CPU
+    """
+    if device != "cuda" or not hasattr(faiss, "StandardGpuResources"):
+        return index, None
+
+    try:
+        resources = faiss.StandardGpuResources()
+        options = faiss.GpuClonerOptions()
+        options.useFloat16 = True  # FP16 lookup tables/storage where the index supports it
+        gpu_index = faiss.index_cpu_to_gpu(resources, 0, index, options)
+        print("FAISS index moved to GPU", file=sys.stderr)
+        return gpu_index, resources
+    except Exception as e:
+        print(f"FAISS GPU transfer failed ({e}), searching on CPU", file=sys.stderr)
+        return index, None
+
+
+def index_to_cpu(index: faiss.Index) -> faiss.Index:
+    """Return a CPU copy of a GPU index (CPU indices are returned unchanged)"""
+    if hasattr(faiss, "GpuIndex") and isinstance(index, faiss.GpuIndex):
+        return faiss.index_gpu_to_cpu(index)
+    return index
+
+
+def read_index_mmap(path: Path) -> faiss.Index:
+    """Read an index memory-mapped and read-only so the OS pages vectors in on demand
+
+    Keeps process RSS proportional to the vectors actually touched and makes cold
+    start near-instant. Older FAISS builds or index types without mmap support
+    fall back to a regular full read.
+    """
+    try:
+        return faiss.read_index(str(path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except (RuntimeError, AttributeError) as e:
+        print(f"Memory-mapped FAISS read unavailable ({e}), loading into RAM", file=sys.stderr)
+        return faiss.read_index(str(path))
@@ -0,0 +1,31 @@
+"""JSON file helpers using orjson when installed (faster, less memory), else the stdlib"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dump_json(obj: Any, path: Path) -> None:
+    """Write obj to path as JSON"""
+    if orjson is not None:
+        with path.open("wb") as f:
+            f.write(orjson.dumps(obj))
+        return
+
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(obj, f)
+
+
+def load_json(path: Path) -> Any:
+    """Read a JSON file"""
+    if orjson is not None:
+        with path.open("rb") as f:
+            return orjson.loads(f.read())
+
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
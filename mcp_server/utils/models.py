@@ -0,0 +1,188 @@
+"""Embedding and reranker model loading shared by the search indices"""
+
+import os
+import platform
+import sys
+from collections.abc import Callable
+from typing import Any
+
+import torch
+from sentence_transformers import CrossEncoder, SentenceTransformer
+
+
+def use_onnx_runtime() -> bool:
+    """Whether ONNX Runtime inference was requested via USE_ORT=1"""
+    return os.environ.get("USE_ORT", "0").lower() in ("1", "true", "yes")
+
+
+def use_int8_reranker() -> bool:
+    """Whether the INT8-quantized ONNX reranker was requested via USE_ORT_INT8=1 (CPU only)"""
+    return os.environ.get("USE_ORT_INT8", "0").lower() in ("1", "true", "yes")
+
+
+def use_torch_compile() -> bool:
+    """Whether torch.compile was requested via TORCH_COMPILE=1"""
+    return os.environ.get("TORCH_COMPILE", "0").lower() in ("1", "true", "yes")
+
+
+def _try_compile(owner: Any, attr: str, warm_up: Callable[[], Any], name: str) -> None:
+    """Replace owner.<attr> with its torch.compile'd version, keeping the original on failure
+
+    Compilation costs ~30 s at startup, so it is opt-in (CUDA only) and pays off for
+    long index builds and busy servers. It happens lazily on the first call, so a
+    warm-up call triggers it here rather than on the first query and surfaces backend
+    errors (e.g. no Triton on Windows) early. dynamic=True avoids recompiling for
+    every batch/sequence length.
+    """
+    if not hasattr(torch, "compile"):
+        return
+
+    original = getattr(owner, attr)
+    try:
+        setattr(owner, attr, torch.compile(original, dynamic=True))
+        warm_up()
+        print(f"{name} compiled with torch.compile", file=sys.stderr)
+    except Exception as e:
+        setattr(owner, attr, original)
+        print(f"torch.compile unavailable for {name.lower()} ({e})", file=sys.stderr)
+
+
+def _allow_tf32() -> None:
+    """Let FP32 matmuls left after the FP16 cast (e.g. pooling) use TF32 tensor cores"""
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+
+
+def _cpu_flags() -> set[str]:
+    """CPU feature flags from /proc/cpuinfo (empty where that is unavailable)"""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return set(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return set()
+
+
+def _quantized_onnx_file() -> str:
+    """Pre-quantized INT8 ONNX export matching this CPU
+
+    sentence-transformers model repos ship these next to onnx/model.onnx; the VNNI
+    variant uses the fused int8 dot-product instructions of recent Xeon/Core CPUs.
+    """
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    flags = _cpu_flags()
+    if "avx512_vnni" in flags:
+        return "onnx/model_qint8_avx512_vnni.onnx"
+    if "avx512f" in flags:
+        return "onnx/model_qint8_avx512.onnx"
+    return "onnx/model_quint8_avx2.onnx"
+
+
+def _onnx_model_kwargs(device: str) -> dict[str, str]:
+    """ONNX Runtime execution provider matching the torch device"""
+    provider = "CUDAExecutionProvider" if device == "cuda" else "CPUExecutionProvider"
+    return {"provider": provider}
+
+
+def model_variant(model: Any) -> str:
+    """Backend and precision of a loaded model, e.g. "torch-float16" or "onnx"
+
+    Part of persistent embedding cache keys, so vectors computed with one backend
+    or dtype are not served after switching to another.
+    """
+    backend = getattr(model, "backend", "torch")
+    if backend != "torch":
+        return backend
+    try:
+        dtype = next(model.parameters()).dtype
+    except (AttributeError, StopIteration):
+        return backend
+    return f"{backend}-{str(dtype).replace('torch.', '')}"
+
+
+def load_embedding_model(model_name: str, device: str) -> SentenceTransformer:
+    """Load a SentenceTransformer embedding model
+
+    With USE_ORT=1 the model is exported to and run through ONNX Runtime (needs
+    sentence-transformers>=3.2 and ``pip install optimum[onnxruntime]`` or
+    ``optimum[onnxruntime-gpu]``); if that fails the PyTorch model is used.
+
+    On CUDA the PyTorch weights are cast to FP16, which roughly doubles encode
+    throughput and halves VRAM use with no measurable retrieval-quality loss for BGE.
+    With TORCH_COMPILE=1 the transformer is additionally compiled with torch.compile.
+    Embeddings then come back as float16 numpy arrays; callers convert to float32
+    before handing them to FAISS.
+    """
+    if use_onnx_runtime():
+        try:
+            model = SentenceTransformer(
+                model_name,
+                device=device,
+                backend="onnx",
+                model_kwargs=_onnx_model_kwargs(device),
+            )
+            print("Embedding model running on ONNX Runtime", file=sys.stderr)
+            return model
+        except Exception as e:
+            print(f"ONNX Runtime unavailable for embeddings ({e}), using PyTorch", file=sys.stderr)
+
+    model = SentenceTransformer(model_name, device=device)
+    if device == "cuda":
+        model.half()
+        _allow_tf32()
+        print("Embedding model running in FP16", file=sys.stderr)
+        if use_torch_compile():
+            _try_compile(
+                model[0], "auto_model", lambda: model.encode(["warm-up"]), "Embedding model"
+            )
+    return model
+
+
+def load_reranker(model_name: str, device: str) -> CrossEncoder:
+    """Load a cross-encoder reranker (ONNX Runtime, FP16 and torch.compile like the embedding model)
+
+    The ONNX backend for cross-encoders needs sentence-transformers>=4.1. On CPU,
+    USE_ORT_INT8=1 loads the model's pre-quantized INT8 ONNX export instead, which
+    roughly doubles to quadruples reranking throughput at a small cost in score
+    precision; if the export is missing the regular loading below is used.
+    """
+    if device == "cpu" and use_int8_reranker():
+        file_name = _quantized_onnx_file()
+        try:
+            reranker = CrossEncoder(
+                model_name,
+                device=device,
+                backend="onnx",
+                model_kwargs={**_onnx_model_kwargs(device), "file_name": file_name},
+            )
+            print(f"Reranker running on ONNX Runtime INT8 ({file_name})", file=sys.stderr)
+            return reranker
+        except Exception as e:
+            print(f"INT8 ONNX reranker unavailable ({e})", file=sys.stderr)
+
+    if use_onnx_runtime():
+        try:
+            reranker = CrossEncoder(
+                model_name,
+                device=device,
+                backend="onnx",
+                model_kwargs=_onnx_model_kwargs(device),
+            )
+            print("Reranker running on ONNX Runtime", file=sys.stderr)
+            return reranker
+        except Exception as e:
+            print(f"ONNX Runtime unavailable for reranker ({e}), using PyTorch", file=sys.stderr)
+
+    reranker = CrossEncoder(model_name, device=device)
+    if device == "cuda":
+        reranker.model.half()
+        _allow_tf32()
+        print("Reranker running in FP16", file=sys.stderr)
+        if use_torch_compile():
+            _try_compile(
+                reranker, "model", lambda: reranker.predict([("warm-up", "warm-up")]), "Reranker"
+            )
+    return reranker
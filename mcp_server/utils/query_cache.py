@@ -0,0 +1,85 @@
+"""Persistent per-query cache (embeddings, HyDE expansions) backed by SQLite"""
+
+import hashlib
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+class QueryCache:
+    """Small key/value store for results that depend only on the query text
+
+    Keys are hashed with BLAKE2b and values stored as raw bytes, so repeated
+    queries across sessions (e.g. the same claim reviewed several times) skip
+    encoding and HyDE generation. The table is trimmed back to max_entries rows
+    on open and every EVICT_EVERY writes, evicting the oldest inserts. Caching
+    is only an optimization: if the database cannot be opened or written,
+    lookups simply miss.
+    """
+
+    MAX_ENTRIES = 20_000  # ~60 MB of 768-d float32 embeddings
+    EVICT_EVERY = 256  # Writes between size checks
+
+    def __init__(self, path: Path, max_entries: int = MAX_ENTRIES):
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.max_entries = max_entries
+        self._writes = 0
+        try:
+            conn = sqlite3.connect(str(path), check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB)")
+            conn.commit()
+            self._conn = conn
+            with self._lock:
+                self._evict()
+        except sqlite3.Error as e:
+            print(f"Query cache disabled ({e})", file=sys.stderr)
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value for key, or None"""
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value FROM cache WHERE key = ?", (self._hash(key),)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store value under key"""
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
+                    (self._hash(key), value),
+                )
+                self._conn.commit()
+                self._writes += 1
+                if self._writes % self.EVICT_EVERY == 0:
+                    self._evict()
+        except sqlite3.Error as e:
+            print(f"Query cache write failed ({e})", file=sys.stderr)
+
+    def _evict(self) -> None:
+        """Delete the oldest rows beyond max_entries (caller holds the lock)
+
+        INSERT OR REPLACE gives a rewritten key a new rowid, so rowid order is
+        insertion order.
+        """
+        self._conn.execute(
+            "DELETE FROM cache WHERE rowid IN "
+            "(SELECT rowid FROM cache ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self._conn.commit()
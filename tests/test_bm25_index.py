@@ -0,0 +1,94 @@
+"""Tests for the array-backed BM25 index"""
+
+import numpy as np
+import pytest
+
+from mcp_server.bm25_index import TOKENIZER, BM25Index, tokenize
+
+CORPUS = [
+    "A claim must particularly point out and distinctly claim the invention.",
+    "The specification shall contain a written description of the invention.",
+    "Antecedent basis: each claim element needs antecedent basis in the claim.",
+    "Drawings shall show every feature of the invention specified in the claims.",
+    "The abstract should not exceed 150 words.",
+    "Means-plus-function claim limitations are construed under 35 U.S.C. 112(f).",
+    "",
+]
+TOKENIZED = [tokenize(doc) for doc in CORPUS]
+
+
+@pytest.fixture
+def index() -> BM25Index:
+    return BM25Index.from_corpus(TOKENIZED)
+
+
+def test_tokenize_lowercases_and_drops_punctuation():
+    assert tokenize("Claim, CLAIMS; 112(f)") == ["claim", "claims", "112", "f"]
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["claim", "antecedent basis claim", "written description invention", "abstract words", "x"],
+)
+def test_scores_match_rank_bm25(index, query):
+    rank_bm25 = pytest.importorskip("rank_bm25")
+    reference = rank_bm25.BM25Okapi(TOKENIZED)
+
+    tokens = tokenize(query)
+    np.testing.assert_allclose(
+        index.get_scores(tokens), reference.get_scores(tokens), rtol=1e-5, atol=1e-6
+    )
+
+
+def test_top_k_returns_best_first(index):
+    tokens = tokenize("claim invention")
+    scores = index.get_scores(tokens)
+
+    ids, top_scores = index.top_k(tokens, 3)
+
+    assert list(ids) == list(np.argsort(-scores, kind="stable")[:3])
+    np.testing.assert_array_equal(top_scores, scores[ids])
+    assert list(top_scores) == sorted(top_scores, reverse=True)
+
+
+def test_top_k_respects_allowed_mask(index):
+    tokens = tokenize("claim")
+    allowed = np.zeros(len(CORPUS), dtype=bool)
+    allowed[[1, 3, 4]] = True
+
+    ids, _ = index.top_k(tokens, 5, allowed)
+
+    # Only allowed documents come back, and k is capped at the number allowed
+    assert sorted(ids) == [1, 3, 4]
+    assert index.top_k(tokens, 5, np.zeros(len(CORPUS), dtype=bool))[0].size == 0
+
+
+def test_top_k_caps_k_at_corpus_size(index):
+    ids, scores = index.top_k(tokenize("claim"), 100)
+
+    assert len(ids) == len(scores) == len(CORPUS)
+
+
+def test_save_load_round_trip(index, tmp_path):
+    path = tmp_path / "bm25.npz"
+    index.save(path)
+
+    loaded = BM25Index.load(path)
+
+    assert loaded.vocab == index.vocab
+    assert loaded.num_docs == index.num_docs
+    assert loaded.tokenizer == TOKENIZER
+    for query in ("claim", "antecedent basis", "abstract"):
+        tokens = tokenize(query)
+        np.testing.assert_array_equal(loaded.get_scores(tokens), index.get_scores(tokens))
+
+
+def test_save_load_empty_index(tmp_path):
+    path = tmp_path / "empty.npz"
+    BM25Index.from_corpus([]).save(path)
+
+    loaded = BM25Index.load(path)
+
+    assert loaded.vocab == {}
+    assert loaded.get_scores(["claim"]).size == 0
+    assert loaded.top_k(["claim"], 5)[0].size == 0
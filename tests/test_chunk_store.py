@@ -0,0 +1,244 @@
+"""Tests for the block-compressed chunk store and the structure-of-arrays metadata"""
+
+import numpy as np
+import pytest
+
+from mcp_server.chunk_store import ChunkMetadata, ChunkStore, PageMetadata
+
+
+def _write_store(tmp_path, chunks) -> ChunkStore:
+    files = (tmp_path / "chunks.bin", tmp_path / "offsets.npy", tmp_path / "blocks.npy")
+    ChunkStore.write(chunks, *files)
+    return ChunkStore(*files)
+
+
+class TestChunkStore:
+    def test_round_trip_across_block_boundaries(self, tmp_path):
+        # Two full blocks plus a partial one, with empty and non-ASCII chunks
+        # straddling the block boundaries
+        size = ChunkStore.BLOCK_SIZE
+        chunks = [f"chunk {i} §{i} " * (i % 5) for i in range(2 * size + 3)]
+        chunks[size - 1] = ""
+        chunks[size] = ""
+        chunks[2 * size] = "Überschrift — 35 U.S.C. § 112"
+
+        store = _write_store(tmp_path, chunks)
+
+        assert len(store) == len(chunks)
+        assert list(store) == chunks
+        assert store.block_offsets is not None
+        assert len(store.block_offsets) == 4  # three blocks plus the end offset
+
+    def test_random_access_and_slices(self, tmp_path):
+        chunks = [f"text {i}" for i in range(ChunkStore.BLOCK_SIZE + 10)]
+        store = _write_store(tmp_path, chunks)
+
+        assert store[ChunkStore.BLOCK_SIZE + 5] == chunks[ChunkStore.BLOCK_SIZE + 5]
+        assert store[0] == chunks[0]
+        assert store[-1] == chunks[-1]
+        assert store[60:70] == chunks[60:70]
+        assert store[::17] == chunks[::17]
+        with pytest.raises(IndexError):
+            store[len(chunks)]
+
+    def test_only_empty_texts(self, tmp_path):
+        store = _write_store(tmp_path, ["", "", ""])
+
+        assert list(store) == ["", "", ""]
+
+    def test_close_releases_files_for_rewrite(self, tmp_path):
+        files = (tmp_path / "chunks.bin", tmp_path / "offsets.npy", tmp_path / "blocks.npy")
+        ChunkStore.write(["old"] * 3, *files)
+
+        with ChunkStore(*files) as store:
+            assert store[1] == "old"
+        assert len(store) == 0
+
+        # Rewriting the closed store's files (refused on Windows while mapped) works
+        ChunkStore.write(["new"], *files)
+        with ChunkStore(*files) as reopened:
+            assert list(reopened) == ["new"]
+
+    def test_empty_store(self, tmp_path):
+        store = _write_store(tmp_path, [])
+
+        assert len(store) == 0
+        assert list(store) == []
+        with pytest.raises(IndexError):
+            store[0]
+
+
+PATENT_RECORDS = [
+    {
+        "patent_id": "11000001",
+        "section": "title",
+        "cpc_codes": ["G06F16/33", "G06N3/08"],
+        "filing_date": "2019-01-02",
+        "grant_date": "2021-05-04",
+        "inventors": ["A. Inventor"],
+        "assignee": "Acme",
+    },
+    {"patent_id": "11000001", "section": "claim_1"},
+    {"patent_id": "11000002", "section": "abstract"},
+    {"patent_id": "11000001", "section": "claim_12"},
+    {"patent_id": "11000003", "section": "description_2"},
+]
+# Patent-level fields come from the first chunk of each patent
+PATENT_FIELDS = {
+    "11000002": {"cpc_codes": ["H04L9/32"], "grant_date": "20180102"},
+    "11000003": {"cpc_codes": [], "grant_date": None},
+}
+
+
+@pytest.fixture
+def patent_metadata() -> ChunkMetadata:
+    records = [{**PATENT_FIELDS.get(r["patent_id"], {}), **r} for r in PATENT_RECORDS]
+    return ChunkMetadata.from_records(records)
+
+
+class TestChunkMetadata:
+    def test_patent_table_and_chunk_rows(self, patent_metadata):
+        assert len(patent_metadata) == 5
+        assert len(patent_metadata.patents) == 3
+
+        claim = patent_metadata[3]
+        assert claim["patent_id"] == "11000001"
+        assert claim["section"] == "claim_12"
+        assert claim["claim_number"] == 12
+        assert claim["assignee"] == "Acme"
+        assert patent_metadata[2]["section"] == "abstract"
+        assert patent_metadata[4]["section"] == "description_2"
+
+    def test_rows_are_copies(self, patent_metadata):
+        patent_metadata[0]["assignee"] = "Changed"
+
+        assert patent_metadata[1]["assignee"] == "Acme"
+
+    def test_chunks_for_patent(self, patent_metadata):
+        assert list(patent_metadata.chunks_for_patent("11000001")) == [0, 1, 3]
+        assert list(patent_metadata.chunks_for_patent("11000003")) == [4]
+        assert patent_metadata.chunks_for_patent("99999999").size == 0
+
+    def test_filter_mask_cpc_prefix(self, patent_metadata):
+        chunk_idx = np.arange(5)
+
+        assert list(patent_metadata.filter_mask(chunk_idx, cpc_prefix="G06N")) == [
+            True,
+            True,
+            False,
+            True,
+            False,
+        ]
+        assert not patent_metadata.filter_mask(chunk_idx, cpc_prefix="A61").any()
+
+    def test_filter_mask_date_range_keeps_undated(self, patent_metadata):
+        mask = patent_metadata.filter_mask(np.array([0, 2, 4]), date_range=("20200101", "20211231"))
+
+        assert list(mask) == [True, False, True]
+
+    @pytest.mark.parametrize(
+        "date_range, expected",
+        [
+            (("2021", "2021"), [True, False, True]),
+            (("2021-05", "2021-05"), [True, False, True]),
+            (("202105", "202106"), [True, False, True]),
+            (("2018-01", "2021-04"), [False, True, True]),
+            (("2021-05-05", "2022"), [False, False, True]),
+            (("", "2019"), [False, True, True]),
+            (("2019", "not a date"), [True, False, True]),
+        ],
+    )
+    def test_filter_mask_partial_and_malformed_bounds(self, patent_metadata, date_range, expected):
+        # Chunks 0, 2 and 4 were granted 2021-05-04, 2018-01-02 and never
+        mask = patent_metadata.filter_mask(np.array([0, 2, 4]), date_range=date_range)
+
+        assert list(mask) == expected
+
+    def test_filter_mask_keeps_malformed_stored_dates(self):
+        metadata = ChunkMetadata.from_records(
+            [
+                {"patent_id": "1", "section": "title", "grant_date": "2021/05/04"},
+                {"patent_id": "2", "section": "title", "grant_date": "²0210504"},
+                {"patent_id": "3", "section": "title", "grant_date": "2021"},
+                {"patent_id": "4", "section": "title", "grant_date": "2010-01-01"},
+            ]
+        )
+
+        mask = metadata.filter_mask(np.arange(4), date_range=("2020", "2022"))
+
+        assert list(mask) == [True, True, True, False]
+
+    def test_filter_mask_combined(self, patent_metadata):
+        mask = patent_metadata.filter_mask(
+            np.array([2, 3]), cpc_prefix="H04L", date_range=("20180101", "20180131")
+        )
+
+        assert list(mask) == [True, False]
+
+    def test_save_load_round_trip(self, patent_metadata, tmp_path):
+        files = (tmp_path / "patents.json", tmp_path / "chunk_meta.npz")
+        patent_metadata.save(*files)
+
+        loaded = ChunkMetadata.load(*files)
+
+        assert list(loaded) == list(patent_metadata)
+        assert list(loaded.chunks_for_patent("11000001")) == [0, 1, 3]
+
+
+PAGE_RECORDS = [
+    {"source": "MPEP", "section": "MPEP 2100", "page": 1, "has_mpep_ref": True},
+    {"source": "MPEP", "section": "MPEP 2100", "page": 1, "has_statute": True},
+    {"source": "35_USC", "section": "35 U.S.C. §112", "page": 3, "is_statute": True},
+    {"source": "MPEP", "section": "MPEP 2100", "page": 2},
+    {"source": "37_CFR", "section": "37 CFR §1.75", "page": 7, "is_regulation": True},
+    {
+        "source": "SUBSEQUENT",
+        "section": "MPEP 2100 update",
+        "page": 1,
+        "is_update": True,
+        "affected_sections": ["2111", "2173"],
+        "has_rule_ref": True,
+    },
+]
+
+
+@pytest.fixture
+def page_metadata() -> PageMetadata:
+    return PageMetadata.from_records(PAGE_RECORDS)
+
+
+class TestPageMetadata:
+    def test_pages_are_shared_and_flags_per_chunk(self, page_metadata):
+        assert len(page_metadata) == 6
+        assert len(page_metadata.pages) == 5  # chunks 0 and 1 come from one page
+
+        first, second = page_metadata[0], page_metadata[1]
+        assert (first["has_mpep_ref"], first["has_statute"]) == (True, False)
+        assert (second["has_mpep_ref"], second["has_statute"]) == (False, True)
+        assert page_metadata[5]["affected_sections"] == ["2111", "2173"]
+        assert page_metadata[5]["has_rule_ref"] is True
+
+    def test_filter_mask(self, page_metadata):
+        assert list(np.flatnonzero(page_metadata.filter_mask(source="MPEP"))) == [0, 1, 3]
+        assert list(np.flatnonzero(page_metadata.filter_mask(is_statute=True))) == [2]
+        assert list(np.flatnonzero(page_metadata.filter_mask(is_update=False))) == [0, 1, 2, 3, 4]
+        assert page_metadata.filter_mask(is_regulation=None).all()
+
+    def test_filter_mask_on_candidates(self, page_metadata):
+        mask = page_metadata.filter_mask(np.array([5, 4, 0]), source="37_CFR", is_regulation=True)
+
+        assert list(mask) == [False, True, False]
+
+    def test_section_chunks(self, page_metadata):
+        assert list(page_metadata.section_chunks("MPEP 2100")) == [0, 1, 3, 5]
+        assert list(page_metadata.section_chunks("§112")) == [2]
+        assert page_metadata.section_chunks("MPEP 608").size == 0
+
+    def test_save_load_round_trip(self, page_metadata, tmp_path):
+        files = (tmp_path / "pages.json", tmp_path / "chunk_meta.npz")
+        page_metadata.save(*files)
+
+        loaded = PageMetadata.load(*files)
+
+        assert list(loaded) == list(page_metadata)
+        assert list(loaded.section_chunks("update")) == [5]
@@ -0,0 +1,231 @@
+"""Tests for the cross-platform path formatting utilities"""
+
+import pytest
+
+from mcp_server import path_utils
+from mcp_server.path_utils import (
+    PathFormatter,
+    PathValidator,
+    auto_format_path,
+    format_for_bash,
+    format_for_powershell,
+    refresh_shell_detection,
+)
+
+posix_only = pytest.mark.skipif(path_utils._IS_WINDOWS, reason="POSIX path layout")
+
+SHELL_VARS = ("MSYSTEM", "WSL_DISTRO_NAME", "PSMODULEPATH", "SHELL")
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    path_utils._clear_path_caches()
+    yield
+    path_utils._clear_path_caches()
+
+
+@pytest.fixture
+def shell_env(monkeypatch):
+    """Clean shell environment; detection is restored from the real one afterwards"""
+    for var in SHELL_VARS:
+        monkeypatch.delenv(var, raising=False)
+    yield monkeypatch
+    monkeypatch.undo()
+    refresh_shell_detection()
+
+
+class TestClassApi:
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "for_bash",
+            "for_powershell",
+            "for_cmd",
+            "auto_format",
+            "normalize",
+            "ensure_posix_str",
+            "get_shell_type",
+            "format_for_claude_mcp",
+        ],
+    )
+    def test_path_formatter_methods(self, name):
+        # Callable on the class and on an instance, like the old staticmethods
+        assert callable(getattr(PathFormatter, name))
+        assert getattr(PathFormatter(), name) is getattr(PathFormatter, name)
+
+    @pytest.mark.parametrize(
+        "name", ["validate_executable", "validate_directory", "validate_many", "suggest_fix"]
+    )
+    def test_path_validator_methods(self, name):
+        assert callable(getattr(PathValidator, name))
+        assert getattr(PathValidator(), name) is getattr(PathValidator, name)
+
+    def test_module_functions_match_class_methods(self, tmp_path):
+        path = tmp_path / "some file.txt"
+
+        assert PathFormatter.for_bash(path) == format_for_bash(path)
+        assert PathFormatter.for_powershell(path) == format_for_powershell(path)
+        assert PathFormatter.auto_format(path) == auto_format_path(path)
+
+
+@posix_only
+class TestFormatting:
+    def test_bash_quotes_only_when_needed(self, tmp_path):
+        assert format_for_bash(tmp_path / "plain.txt") == f"{tmp_path}/plain.txt"
+        assert format_for_bash(tmp_path / "a b.txt") == f"'{tmp_path}/a b.txt'"
+        assert format_for_bash(tmp_path / "it's here") == f"'{tmp_path}/it'\"'\"'s here'"
+
+    def test_powershell_and_cmd_quote_spaces(self, tmp_path):
+        path = tmp_path / "a b.txt"
+
+        assert PathFormatter.for_powershell(path) == f'"{path}"'
+        assert PathFormatter.for_cmd(path) == f'"{path}"'
+        assert PathFormatter.for_cmd(tmp_path / "ab.txt") == f"{tmp_path}/ab.txt"
+
+    def test_str_and_path_inputs_agree(self, tmp_path):
+        path = tmp_path / "x y"
+
+        assert format_for_bash(path) == format_for_bash(str(path))
+
+    def test_normalize_and_posix_str(self, tmp_path):
+        target = tmp_path / "dir" / ".." / "file.txt"
+
+        assert PathFormatter.normalize(target) == (tmp_path / "file.txt").resolve()
+        assert (
+            PathFormatter.ensure_posix_str(target) == (tmp_path / "file.txt").resolve().as_posix()
+        )
+        assert PathFormatter.format_for_claude_mcp(target, tmp_path) == (
+            (tmp_path / "file.txt").resolve().as_posix(),
+            tmp_path.resolve().as_posix(),
+        )
+
+    def test_dot_dot_after_symlink_follows_the_link(self, tmp_path):
+        (tmp_path / "real" / "sub").mkdir(parents=True)
+        (tmp_path / "link").symlink_to(tmp_path / "real" / "sub")
+
+        # link/.. is the parent of the link target, not tmp_path
+        formatted = format_for_bash(f"{tmp_path}/link/../target")
+
+        assert formatted == str((tmp_path / "real" / "target").resolve())
+
+    def test_symlinks_are_kept_without_dot_dot(self, tmp_path):
+        (tmp_path / "real").mkdir()
+        (tmp_path / "link").symlink_to(tmp_path / "real")
+
+        assert format_for_bash(tmp_path / "link" / "f") == f"{tmp_path}/link/f"
+
+
+@posix_only
+class TestCaches:
+    def test_relative_paths_are_stale_until_caches_clear(self, tmp_path, monkeypatch):
+        first, second = tmp_path / "first", tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+
+        monkeypatch.chdir(first)
+        assert format_for_bash("file.txt") == f"{first}/file.txt"
+
+        # Relative paths are cached as given, so a chdir alone keeps the old answer
+        monkeypatch.chdir(second)
+        assert format_for_bash("file.txt") == f"{first}/file.txt"
+
+        path_utils._clear_path_caches()
+        assert format_for_bash("file.txt") == f"{second}/file.txt"
+        assert PathFormatter.normalize("file.txt") == second.resolve() / "file.txt"
+
+
+class TestShellDetection:
+    @pytest.mark.parametrize(
+        "var, value, expected",
+        [
+            ("MSYSTEM", "MINGW64", "git-bash"),
+            ("WSL_DISTRO_NAME", "Ubuntu", "wsl"),
+            ("PSMODULEPATH", "C:\\Modules", "powershell"),
+            ("SHELL", "/usr/bin/zsh", "zsh"),
+            ("SHELL", "/bin/dash", "sh"),
+            ("SHELL", "/home/bash-user/bin/fish", "fish"),
+        ],
+    )
+    def test_detects_shell(self, shell_env, var, value, expected):
+        shell_env.setenv(var, value)
+        refresh_shell_detection()
+
+        assert PathFormatter.get_shell_type() == expected
+
+    def test_refresh_replaces_stale_detection(self, shell_env):
+        shell_env.setenv("MSYSTEM", "MINGW64")
+        refresh_shell_detection()
+        assert PathFormatter.get_shell_type() == "git-bash"
+
+        # Detection happens once, so changing the environment alone is not seen...
+        shell_env.delenv("MSYSTEM")
+        shell_env.setenv("PSMODULEPATH", "C:\\Modules")
+        assert PathFormatter.get_shell_type() == "git-bash"
+
+        # ...until refresh_shell_detection() re-reads it
+        refresh_shell_detection()
+        assert PathFormatter.get_shell_type() == "powershell"
+
+    def test_auto_format_follows_refreshed_shell(self, shell_env, tmp_path):
+        path = tmp_path / "a b.txt"
+
+        shell_env.setenv("PSMODULEPATH", "C:\\Modules")
+        refresh_shell_detection()
+        assert auto_format_path(path) == format_for_powershell(path)
+
+        shell_env.setenv("MSYSTEM", "MINGW64")
+        refresh_shell_detection()
+        assert auto_format_path(path) == format_for_bash(path)
+
+
+class TestValidation:
+    def test_validate_executable(self, tmp_path):
+        script = tmp_path / "run.sh"
+        script.write_text("#!/bin/sh\n")
+
+        assert PathValidator.validate_executable(tmp_path / "missing")[0] is False
+        assert PathValidator.validate_executable(tmp_path)[1].startswith("Not a file")
+        if not path_utils._IS_WINDOWS:
+            assert PathValidator.validate_executable(script)[1].startswith("Not executable")
+        script.chmod(0o755)
+        assert PathValidator.validate_executable(script) == (True, "")
+
+    @posix_only
+    def test_validate_executable_asks_this_process(self, tmp_path, monkeypatch):
+        script = tmp_path / "run.sh"
+        script.write_text("#!/bin/sh\n")
+        script.chmod(0o701)  # executable by others only
+        monkeypatch.setattr(path_utils.os, "access", lambda path, mode: False)
+
+        assert PathValidator.validate_executable(script)[1].startswith("Not executable")
+        assert PathValidator.validate_many([script, tmp_path / "x"])[0][1].startswith(
+            "Not executable"
+        )
+
+    def test_validate_many_matches_single_checks(self, tmp_path):
+        (tmp_path / "dir").mkdir()
+        (tmp_path / "file").write_text("")
+        paths = [tmp_path / "dir", tmp_path / "file", tmp_path / "missing", tmp_path]
+
+        assert PathValidator.validate_many(paths, directories=True) == [
+            PathValidator.validate_directory(path) for path in paths
+        ]
+        assert PathValidator.validate_many(paths) == [
+            PathValidator.validate_executable(path) for path in paths
+        ]
+
+    def test_suggest_fix_keyword_priority(self, tmp_path, shell_env):
+        shell_env.setenv("SHELL", "/bin/bash")
+        refresh_shell_detection()
+        path = tmp_path / "new dir"
+
+        # "not found" wins over "spaces", and matching ignores case
+        assert PathValidator.suggest_fix(path, "Not Found (path has spaces)") == (
+            f"Create with: mkdir '{path}'"
+        )
+        assert PathValidator.suggest_fix(path, "path has SPACES") == f"Quote the path: '{path}'"
+        assert (
+            PathValidator.suggest_fix(path, "not executable")
+            == f"Make executable: chmod +x '{path}'"
+        )
+        assert PathValidator.suggest_fix(path, "unknown") == "No suggestion available"
@@ -0,0 +1,54 @@
+"""Tests for the USPTO API client's patent lookup cache"""
+
+import pytest
+
+pytest.importorskip("requests")
+
+from mcp_server.uspto_api import USPTOClient  # noqa: E402
+
+PATENT = {
+    "applicationNumberText": "16123456",
+    "applicationMetaData": {"patentNumber": "11234567", "inventionTitle": "Widget"},
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = USPTOClient(api_key="test-key")
+    responses = []
+
+    def search_patents(**kwargs):
+        client.calls += 1
+        return responses.pop(0)
+
+    client.calls = 0
+    client.responses = responses
+    monkeypatch.setattr(client, "search_patents", search_patents)
+    return client
+
+
+def test_miss_is_not_cached_and_later_hit_is(client):
+    client.responses.extend([{"results": []}, {"results": [PATENT]}])
+
+    # Not found (e.g. not yet in the dataset): asked again next time
+    assert client.get_patent_by_number("11234567") is None
+    patent = client.get_patent_by_number("11234567")
+    assert patent.title == "Widget"
+
+    # Found: served from the cache without another request
+    assert client.get_patent_by_number("11234567") is patent
+    assert client.calls == 2
+
+
+def test_cache_evicts_least_recently_used(client, monkeypatch):
+    monkeypatch.setattr(USPTOClient, "PATENT_CACHE_SIZE", 2)
+    client.responses.extend({"results": [PATENT]} for _ in range(4))
+
+    first = client.get_patent_by_number("1")
+    client.get_patent_by_number("2")
+    assert client.get_patent_by_number("1") is first  # "1" is now most recent
+    client.get_patent_by_number("3")  # evicts "2"
+
+    assert client.get_patent_by_number("1") is first
+    client.get_patent_by_number("2")
+    assert client.calls == 4